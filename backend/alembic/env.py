@@ -10,7 +10,7 @@ from app.core.config import settings
 from app.db.base import Base
 from app.db.session import sync_engine
 # Импортируем все модели для autogenerate
-from app.db.models import Admin, Nomination, Nominee, Setting, Vote  # noqa: F401
+from app.db.models import Admin, BotFsmState, Nomination, Nominee, NomineeVoteCount, Setting, UserVoteIndex, Vote  # noqa: F401
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,52 @@
+"""Add nomination_id to vote with per-nomination unique constraint
+
+Revision ID: 3a7d2c9b41e0
+Revises: fcb4b3f17ee9
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3a7d2c9b41e0"
+down_revision: Union[str, None] = "fcb4b3f17ee9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Добавляем колонку nomination_id и заполняем её из номинанта
+    op.add_column("vote", sa.Column("nomination_id", sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE vote SET nomination_id = nominee.nomination_id "
+        "FROM nominee WHERE nominee.id = vote.nominee_id"
+    )
+
+    # Убираем дубликаты, которые могли проскочить до появления ограничения (оставляем первый голос)
+    op.execute(
+        "DELETE FROM vote v USING vote d "
+        "WHERE v.telegram_user_id = d.telegram_user_id "
+        "AND v.nomination_id = d.nomination_id AND v.id > d.id"
+    )
+
+    op.alter_column("vote", "nomination_id", nullable=False)
+    op.create_foreign_key(
+        "vote_nomination_id_fkey", "vote", "nomination", ["nomination_id"], ["id"], ondelete="CASCADE"
+    )
+    op.create_index("ix_vote_nomination_id", "vote", ["nomination_id"], unique=False)
+
+    # Один голос на номинацию теперь гарантирует сама база
+    op.drop_constraint("unique_user_vote_per_nominee", "vote", type_="unique")
+    op.create_unique_constraint("uq_vote_user_nomination", "vote", ["telegram_user_id", "nomination_id"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_vote_user_nomination", "vote", type_="unique")
+    op.create_unique_constraint("unique_user_vote_per_nominee", "vote", ["telegram_user_id", "nominee_id"])
+    op.drop_index("ix_vote_nomination_id", table_name="vote")
+    op.drop_constraint("vote_nomination_id_fkey", "vote", type_="foreignkey")
+    op.drop_column("vote", "nomination_id")
@@ -0,0 +1,44 @@
+"""Add sharded nominee_vote_count counter table
+
+Revision ID: 8e1f4b6a2c93
+Revises: 3a7d2c9b41e0
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e1f4b6a2c93"
+down_revision: Union[str, None] = "3a7d2c9b41e0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Должно совпадать со значением по умолчанию VOTE_COUNTER_SHARDS;
+# при другом значении достаточно запустить `python -m app.cli reconcile-counts`
+DEFAULT_SHARDS = 16
+
+
+def upgrade() -> None:
+    op.create_table(
+        "nominee_vote_count",
+        sa.Column("nominee_id", sa.Integer(), nullable=False),
+        sa.Column("shard", sa.SmallInteger(), nullable=False),
+        sa.Column("count", sa.BigInteger(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["nominee_id"], ["nominee.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("nominee_id", "shard"),
+    )
+
+    # Заполняем счётчики из уже существующих голосов
+    op.execute(
+        "INSERT INTO nominee_vote_count (nominee_id, shard, count) "
+        f"SELECT nominee_id, telegram_user_id % {DEFAULT_SHARDS}, count(*) "
+        f"FROM vote GROUP BY nominee_id, telegram_user_id % {DEFAULT_SHARDS}"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("nominee_vote_count")
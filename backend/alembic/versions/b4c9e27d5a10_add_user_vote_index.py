@@ -0,0 +1,44 @@
+"""Add user_vote_index with voted nomination ids per user
+
+Revision ID: b4c9e27d5a10
+Revises: 8e1f4b6a2c93
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b4c9e27d5a10"
+down_revision: Union[str, None] = "8e1f4b6a2c93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_vote_index",
+        sa.Column("telegram_user_id", sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column(
+            "nomination_ids",
+            postgresql.ARRAY(sa.Integer()),
+            server_default=sa.text("'{}'"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("telegram_user_id"),
+    )
+
+    # Заполняем индекс из уже существующих голосов
+    op.execute(
+        "INSERT INTO user_vote_index (telegram_user_id, nomination_ids) "
+        "SELECT telegram_user_id, array_agg(DISTINCT nomination_id ORDER BY nomination_id) "
+        "FROM vote GROUP BY telegram_user_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_vote_index")
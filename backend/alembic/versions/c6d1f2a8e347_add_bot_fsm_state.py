@@ -0,0 +1,36 @@
+"""Add bot_fsm_state for persistent admin bot conversations
+
+Revision ID: c6d1f2a8e347
+Revises: b4c9e27d5a10
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c6d1f2a8e347"
+down_revision: Union[str, None] = "b4c9e27d5a10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "bot_fsm_state",
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("state", sa.String(length=255), nullable=True),
+        sa.Column("data", sa.LargeBinary(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    # Индекс по сроку нужен фоновой очистке устаревших диалогов
+    op.create_index(op.f("ix_bot_fsm_state_expires_at"), "bot_fsm_state", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_bot_fsm_state_expires_at"), table_name="bot_fsm_state")
+    op.drop_table("bot_fsm_state")
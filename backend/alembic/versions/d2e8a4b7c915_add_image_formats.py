@@ -0,0 +1,38 @@
+"""Add image_formats to nomination and nominee
+
+Revision ID: d2e8a4b7c915
+Revises: c6d1f2a8e347
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2e8a4b7c915"
+down_revision: Union[str, None] = "c6d1f2a8e347"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Пустой список: для старых изображений копии появятся после backfill-images
+    for table in ("nomination", "nominee"):
+        op.add_column(
+            table,
+            sa.Column(
+                "image_formats",
+                postgresql.ARRAY(sa.String(length=16)),
+                server_default=sa.text("'{}'"),
+                nullable=False,
+            ),
+        )
+
+
+def downgrade() -> None:
+    for table in ("nominee", "nomination"):
+        op.drop_column(table, "image_formats")
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.services.admin_service import is_admin
+from app.services.export_service import ExportMode, export_filename, iter_export_csv
+from app.utils.telegram_auth import get_telegram_user_id
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+async def get_admin_user_id(telegram_user_id: int = Depends(get_telegram_user_id)) -> int:
+    """Dependency, которая пропускает только администраторов."""
+
+    if not await is_admin(telegram_user_id):
+        raise HTTPException(status_code=403, detail="Нет прав администратора")
+    return telegram_user_id
+
+
+@router.get("/export.csv", dependencies=[Depends(get_admin_user_id)])
+async def export_csv(
+    mode: ExportMode = Query(default="aggregate"),
+    gzip: bool = Query(default=False),
+) -> StreamingResponse:
+    """
+    Этот эндпоинт отдаёт CSV-выгрузку потоком (chunked transfer).
+
+    mode=aggregate — итоги по номинантам, mode=raw — все голоса. При gzip=true
+    отдаётся файл .csv.gz. Память сервера не зависит от числа голосов.
+    """
+
+    filename = export_filename(mode, gzip)
+    return StreamingResponse(
+        iter_export_csv(mode, compress=gzip),
+        media_type="application/gzip" if gzip else "text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
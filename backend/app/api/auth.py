@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+
+from app.schemas.auth import SessionTokenResponse
+from app.utils.session_token import issue_session_token
+from app.utils.telegram_auth import get_init_data_user_id
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+@router.post("/session", response_model=SessionTokenResponse)
+async def create_session(
+    telegram_user_id: int = Depends(get_init_data_user_id),
+) -> SessionTokenResponse:
+    """
+    Этот эндпоинт обменивает initData на токен сессии.
+
+    Требуется заголовок X-Telegram-Init-Data. Дальше Mini App отправляет
+    заголовок Authorization: Bearer <token> вместо полного initData.
+    """
+
+    token, expires_at = issue_session_token(telegram_user_id)
+    return SessionTokenResponse(token=token, expires_at=expires_at)
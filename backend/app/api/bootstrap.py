@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_session
+from app.schemas.bootstrap import BootstrapResponse
+from app.services.bootstrap_service import encode_bootstrap
+from app.utils.response_cache import CachedResponse, respond_cached
+from app.utils.telegram_auth import get_telegram_user_id
+
+router = APIRouter(prefix="/bootstrap", tags=["bootstrap"])
+
+
+@router.get("", response_model=BootstrapResponse)
+async def bootstrap(
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    telegram_user_id: int = Depends(get_telegram_user_id),
+) -> Response:
+    """
+    Этот эндпоинт возвращает всё стартовое состояние Mini App одним ответом.
+
+    В ответе номинации с номинантами и голосами, флаг голосования и номинации,
+    в которых пользователь уже голосовал. Повторный запрос с тем же ETag получает 304.
+    """
+
+    body = await encode_bootstrap(session, telegram_user_id)
+    # Тело своё у каждого пользователя: не сжимаем заранее, но If-None-Match разбираем как в общем кэше
+    entry = CachedResponse(None, body, compress=False)
+    return respond_cached(request, entry, cache_control="private, no-cache")
@@ -1,19 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_session
 from app.schemas.nomination import NominationListResponse, NominationResponse
-from app.services.nomination_service import get_all_nominations, get_nomination_by_id
+from app.services.catalog_service import get_catalog
+from app.services.nomination_service import get_nomination_by_id, get_nomination_rows
+from app.utils.response_cache import response_cache
 
 router = APIRouter(prefix="/nominations", tags=["nominations"])
 
 
 @router.get("", response_model=NominationListResponse)
-async def list_nominations(session: AsyncSession = Depends(get_session)) -> NominationListResponse:
-    """Этот эндпоинт возвращает список всех номинаций."""
+async def list_nominations(request: Request, session: AsyncSession = Depends(get_session)) -> Response:
+    """Этот эндпоинт возвращает список всех номинаций (из кэша ответов до правки каталога)."""
 
-    nominations = await get_all_nominations(session)
-    return NominationListResponse(nominations=nominations)
+    async def build() -> dict:
+        return {"nominations": await get_nomination_rows(session)}
+
+    catalog = await get_catalog()
+    return await response_cache.respond(request, ("nominations",), catalog.version, build)
 
 
 @router.get("/{nomination_id}", response_model=NominationResponse)
@@ -1,19 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_session
 from app.schemas.nominee import NomineeListResponse
+from app.services.catalog_service import get_catalog
 from app.services.nominee_service import get_nominees_by_nomination
+from app.services.results_stream import results_aggregator
+from app.utils.response_cache import response_cache
 
 router = APIRouter(prefix="/nominations", tags=["nominees"])
 
 
 @router.get("/{nomination_id}/nominees", response_model=NomineeListResponse)
 async def list_nominees(
-    nomination_id: int, session: AsyncSession = Depends(get_session)
-) -> NomineeListResponse:
-    """Этот эндпоинт возвращает список номинантов по номинации."""
+    nomination_id: int, request: Request, session: AsyncSession = Depends(get_session)
+) -> Response:
+    """Этот эндпоинт возвращает список номинантов по номинации (из кэша ответов)."""
 
-    nominees = await get_nominees_by_nomination(session, nomination_id)
-    return NomineeListResponse(nominees=nominees)
+    async def build() -> dict:
+        return {"nominees": await get_nominees_by_nomination(session, nomination_id)}
+
+    catalog = await get_catalog()
+    version = (catalog.version, results_aggregator.results_version)
+    return await response_cache.respond(request, ("nominees", nomination_id), version, build)
 
@@ -1,30 +1,113 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.db.session import get_session
 from app.schemas.result import NominationResultResponse, ResultsSummaryResponse
-from app.services.result_service import get_all_results, get_results_by_nomination
+from app.services.catalog_service import get_catalog
+from app.services.result_service import get_all_results_data, get_results_data_by_nomination
+from app.services.results_stream import StreamMessage, results_aggregator
+from app.utils.response_cache import response_cache
 
 router = APIRouter(prefix="/results", tags=["results"])
 
 
+async def _results_version() -> tuple[int, int]:
+    """Эта функция отдаёт версию данных результатов: каталог плюс тики голосования."""
+
+    catalog = await get_catalog()
+    return catalog.version, results_aggregator.results_version
+
+
 @router.get("", response_model=ResultsSummaryResponse)
 async def list_all_results(
+    request: Request,
     session: AsyncSession = Depends(get_session),
-) -> ResultsSummaryResponse:
-    """Этот эндпоинт возвращает результаты по всем номинациям."""
+) -> Response:
+    """Этот эндпоинт возвращает результаты по всем номинациям (из кэша ответов)."""
+
+    async def build() -> dict:
+        return await get_all_results_data(session)
+
+    return await response_cache.respond(request, ("results",), await _results_version(), build)
+
+
+async def _next_message(queue: asyncio.Queue[StreamMessage | None]) -> StreamMessage | None:
+    """Эта функция ждёт следующее сообщение потока; по таймауту возвращает None для keepalive."""
+
+    try:
+        message = await asyncio.wait_for(queue.get(), settings.results_stream_keepalive_seconds)
+    except asyncio.TimeoutError:
+        return None
+    # Подписчик отстал и пропустил дельты: отдаём ему свежий снимок
+    return message or results_aggregator.snapshot_message()
+
 
-    return await get_all_results(session)
+async def _sse_events(queue: asyncio.Queue[StreamMessage | None]) -> AsyncIterator[str]:
+    """Эта функция превращает очередь подписчика в поток Server-Sent Events."""
+
+    try:
+        while True:
+            message = await _next_message(queue)
+            if message is None:
+                yield ": keepalive\n\n"
+                continue
+            event, data = message
+            yield f"event: {event}\ndata: {data}\n\n"
+    finally:
+        results_aggregator.unsubscribe(queue)
+
+
+@router.get("/stream")
+async def stream_results() -> StreamingResponse:
+    """
+    Этот эндпоинт отдаёт поток результатов по Server-Sent Events.
+
+    Первое событие snapshot содержит все счётчики голосов, дальше приходят события
+    delta только с изменившимися счётчиками (не чаще раза в тик). Событие reload
+    означает, что изменился состав номинаций и структуру нужно перечитать.
+    """
+
+    queue = await results_aggregator.subscribe()
+    return StreamingResponse(
+        _sse_events(queue),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def results_websocket(websocket: WebSocket) -> None:
+    """Этот WebSocket отдаёт те же события, что и /stream, JSON-сообщениями."""
+
+    await websocket.accept()
+    queue = await results_aggregator.subscribe()
+    try:
+        while True:
+            message = await _next_message(queue)
+            await websocket.send_text(message[1] if message else '{"type":"ping"}')
+    except WebSocketDisconnect:
+        pass
+    finally:
+        results_aggregator.unsubscribe(queue)
 
 
 @router.get("/{nomination_id}", response_model=NominationResultResponse)
 async def get_nomination_results(
-    nomination_id: int, session: AsyncSession = Depends(get_session)
-) -> NominationResultResponse:
-    """Этот эндпоинт возвращает результаты по конкретной номинации."""
-
-    result = await get_results_by_nomination(session, nomination_id)
-    if not result:
-        raise HTTPException(status_code=404, detail="Номинация не найдена")
-    return result
+    nomination_id: int, request: Request, session: AsyncSession = Depends(get_session)
+) -> Response:
+    """Этот эндпоинт возвращает результаты по конкретной номинации (из кэша ответов)."""
+
+    async def build() -> dict:
+        result = await get_results_data_by_nomination(session, nomination_id)
+        if not result:
+            raise HTTPException(status_code=404, detail="Номинация не найдена")
+        return result
+
+    key = ("results", nomination_id)
+    return await response_cache.respond(request, key, await _results_version(), build)
 
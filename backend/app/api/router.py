@@ -1,12 +1,15 @@
 from fastapi import APIRouter
 
-from app.api import nominees, nominations, results, votes
+from app.api import admin, auth, bootstrap, nominees, nominations, results, votes
 
 
 def get_api_router() -> APIRouter:
     """Этот роутер собирает все публичные маршруты API."""
 
     router = APIRouter(prefix="/api")
+    router.include_router(auth.router)
+    router.include_router(admin.router)
+    router.include_router(bootstrap.router)
     router.include_router(nominations.router)
     router.include_router(nominees.router)
     router.include_router(votes.router)
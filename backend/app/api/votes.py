@@ -2,8 +2,15 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_session
-from app.schemas.vote import VoteCreate, VoteResponse
-from app.services.vote_service import create_vote
+from app.schemas.vote import (
+    VoteBatchCreate,
+    VoteBatchResponse,
+    VoteCreate,
+    VoteResponse,
+    VotedNominationsResponse,
+)
+from app.services.user_votes_service import get_voted_nominations
+from app.services.vote_service import create_vote, create_votes
 from app.utils.telegram_auth import get_telegram_user_id
 
 router = APIRouter(prefix="/votes", tags=["votes"])
@@ -28,3 +35,34 @@ async def vote(
         nomination_id=vote_data.nomination_id,
     )
 
+
+@router.post("/batch", response_model=VoteBatchResponse)
+async def vote_batch(
+    batch: VoteBatchCreate,
+    session: AsyncSession = Depends(get_session),
+    telegram_user_id: int = Depends(get_telegram_user_id),
+) -> VoteBatchResponse:
+    """
+    Этот эндпоинт принимает сразу несколько голосов, по одному на номинацию.
+
+    Каждый голос получает свой ответ в том же порядке: одни могут быть приняты,
+    другие отклонены (например, если пользователь уже голосовал в номинации).
+    """
+
+    results = await create_votes(
+        session,
+        telegram_user_id=telegram_user_id,
+        votes=[(vote_data.nominee_id, vote_data.nomination_id) for vote_data in batch.votes],
+    )
+    return VoteBatchResponse(results=results)
+
+
+@router.get("/me", response_model=VotedNominationsResponse)
+async def my_votes(
+    session: AsyncSession = Depends(get_session),
+    telegram_user_id: int = Depends(get_telegram_user_id),
+) -> VotedNominationsResponse:
+    """Этот эндпоинт возвращает номинации, в которых пользователь уже голосовал."""
+
+    nomination_ids = await get_voted_nominations(session, telegram_user_id)
+    return VotedNominationsResponse(nomination_ids=sorted(nomination_ids))
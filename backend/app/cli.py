@@ -0,0 +1,136 @@
+import argparse
+import asyncio
+from pathlib import Path
+
+from app.db.session import async_session_factory
+from app.services.admin_service import add_admin, remove_admin
+from app.services.export_service import export_votes_columnar
+from app.services.media_service import backfill_derivatives, collect_media_garbage, migrate_legacy_media
+from app.services.user_votes_service import rebuild_user_vote_index
+from app.services.vote_count_service import reconcile_vote_counts
+from app.utils.image_executor import image_executor
+
+
+async def _reconcile_counts() -> None:
+    """Эта функция пересобирает счётчики голосов и печатает итог."""
+
+    async with async_session_factory() as session:
+        nominees = await reconcile_vote_counts(session)
+    print(f"Счётчики голосов пересобраны, номинантов с голосами: {nominees}")
+
+
+async def _reconcile_user_votes() -> None:
+    """Эта функция пересобирает индекс голосов пользователей и печатает итог."""
+
+    async with async_session_factory() as session:
+        users = await rebuild_user_vote_index(session)
+    print(f"Индекс голосов пересобран, пользователей: {users}")
+
+
+async def _export_votes(output: Path) -> None:
+    """Эта функция выгружает голоса по колонкам в zip с файлами .npy."""
+
+    rows = await export_votes_columnar(output)
+    print(f"Выгружено голосов: {rows}, файл: {output}")
+
+
+async def _backfill_images(force: bool) -> None:
+    """Эта функция строит уменьшенные копии изображений и печатает итог."""
+
+    try:
+        async with async_session_factory() as session:
+            rendered, skipped, failed = await backfill_derivatives(session, force=force)
+    finally:
+        image_executor.stop()
+    print(f"Производные изображений построены: {rendered}, уже были: {skipped}, ошибок: {failed}")
+
+
+async def _migrate_media() -> None:
+    """Эта функция переносит изображения со старыми именами в хранилище блобов и печатает итог."""
+
+    try:
+        async with async_session_factory() as session:
+            moved = await migrate_legacy_media(session)
+    finally:
+        image_executor.stop()
+    print(f"Изображений перенесено в хранилище: {moved}")
+
+
+async def _collect_media_garbage(grace_seconds: float) -> None:
+    """Эта функция удаляет файлы медиа без ссылок и печатает итог."""
+
+    async with async_session_factory() as session:
+        removed = await collect_media_garbage(session, grace_seconds)
+    print(f"Удалено файлов без ссылок: {removed}")
+
+
+async def _add_admin(telegram_id: int) -> None:
+    """Эта функция добавляет администратора; воркеры сбросят множество администраторов по NOTIFY."""
+
+    async with async_session_factory() as session:
+        await add_admin(session, telegram_id)
+    print(f"Администратор добавлен: {telegram_id}")
+
+
+async def _remove_admin(telegram_id: int) -> None:
+    """Эта функция удаляет администратора; воркеры сбросят множество администраторов по NOTIFY."""
+
+    async with async_session_factory() as session:
+        removed = await remove_admin(session, telegram_id)
+    if removed:
+        print(f"Администратор удалён: {telegram_id}")
+    else:
+        print(f"Администратора {telegram_id} нет в БД (администраторы из ADMIN_IDS удаляются в настройках)")
+
+
+def main() -> None:
+    """Эта функция разбирает аргументы командной строки и запускает команду."""
+
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Служебные команды VRP")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("reconcile-counts", help="пересобрать счётчики голосов из таблицы vote")
+    subparsers.add_parser(
+        "reconcile-user-votes", help="пересобрать индекс номинаций, где голосовал пользователь"
+    )
+    export_parser = subparsers.add_parser(
+        "export-votes", help="выгрузить голоса по колонкам (.npy в zip) для анализа"
+    )
+    export_parser.add_argument("--output", type=Path, default=Path("votes.zip"), help="путь к zip-файлу")
+    backfill_parser = subparsers.add_parser(
+        "backfill-images", help="построить уменьшенные копии (WebP/AVIF) для загруженных изображений"
+    )
+    backfill_parser.add_argument("--force", action="store_true", help="перестроить уже существующие копии")
+    subparsers.add_parser(
+        "migrate-media", help="перенести изображения со старыми именами в хранилище по SHA-256"
+    )
+    gc_parser = subparsers.add_parser("gc-media", help="удалить файлы медиа, на которые нет ссылок в БД")
+    gc_parser.add_argument(
+        "--grace-seconds", type=float, default=3600, help="не трогать файлы моложе этого возраста"
+    )
+
+    add_admin_parser = subparsers.add_parser("add-admin", help="добавить администратора бота")
+    add_admin_parser.add_argument("telegram_id", type=int, help="Telegram ID пользователя")
+    remove_admin_parser = subparsers.add_parser("remove-admin", help="удалить администратора бота")
+    remove_admin_parser.add_argument("telegram_id", type=int, help="Telegram ID пользователя")
+
+    args = parser.parse_args()
+    if args.command == "reconcile-counts":
+        asyncio.run(_reconcile_counts())
+    elif args.command == "reconcile-user-votes":
+        asyncio.run(_reconcile_user_votes())
+    elif args.command == "export-votes":
+        asyncio.run(_export_votes(args.output))
+    elif args.command == "backfill-images":
+        asyncio.run(_backfill_images(args.force))
+    elif args.command == "migrate-media":
+        asyncio.run(_migrate_media())
+    elif args.command == "gc-media":
+        asyncio.run(_collect_media_garbage(args.grace_seconds))
+    elif args.command == "add-admin":
+        asyncio.run(_add_admin(args.telegram_id))
+    elif args.command == "remove-admin":
+        asyncio.run(_remove_admin(args.telegram_id))
+
+
+if __name__ == "__main__":
+    main()
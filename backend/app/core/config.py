@@ -16,10 +16,42 @@ class Settings(BaseSettings):
     postgres_host: str = Field(default="localhost")
     postgres_port: int = Field(default=5432)
     telegram_bot_token: str = Field(default="")
+    telegram_init_data_max_age_seconds: int = Field(default=86400, ge=1)
+    telegram_auth_cache_size: int = Field(default=10000, ge=1)
+    telegram_webhook_url: str = Field(default="")
+    telegram_webhook_secret: str = Field(default="", pattern=r"^[A-Za-z0-9_-]{0,256}$")
+    telegram_webhook_max_concurrency: int = Field(default=32, ge=1, le=100)
+    session_secret: str = Field(default="")
+    session_token_ttl_seconds: int = Field(default=43200, ge=60)
     admin_ids: list[int] = Field(default_factory=list)
     voting_open_default: bool = Field(default=True)
+    settings_cache_ttl_seconds: float = Field(default=5.0, ge=0)
+    admin_cache_ttl_seconds: float = Field(default=30.0, ge=0)
     media_folder: str = Field(default="uploads")
     development_mode: bool = Field(default=False)
+    vote_counter_shards: int = Field(default=16, ge=1)
+    user_votes_cache_size: int = Field(default=100_000, ge=1)
+    vote_ingest_batched: bool = Field(default=False)
+    vote_batch_max_size: int = Field(default=500, ge=1, le=5000)
+    vote_batch_max_delay_ms: int = Field(default=20, ge=1)
+    vote_batch_queue_size: int = Field(default=10000, ge=1)
+    results_stream_tick_ms: int = Field(default=1000, ge=50)
+    results_stream_queue_size: int = Field(default=64, ge=1)
+    results_stream_keepalive_seconds: float = Field(default=15.0, gt=0)
+    response_cache_size: int = Field(default=1024, ge=1)
+    export_chunk_rows: int = Field(default=5000, ge=100)
+    export_spool_max_bytes: int = Field(default=8 * 1024 * 1024, ge=0)
+    export_folder: str = Field(default="exports")
+    export_interval_minutes: int = Field(default=0, ge=0)
+    reconcile_interval_minutes: int = Field(default=0, ge=0)
+    leader_retry_seconds: float = Field(default=5.0, gt=0)
+    fsm_ttl_seconds: int = Field(default=86400, ge=60)
+    fsm_cache_size: int = Field(default=1000, ge=1)
+    fsm_sweep_interval_seconds: int = Field(default=600, ge=10)
+    image_workers: int = Field(default=2, ge=1)
+    image_queue_size: int = Field(default=8, ge=0)
+    media_gc_interval_minutes: int = Field(default=60, ge=0)
+    media_gc_grace_seconds: int = Field(default=3600, ge=0)
 
     @computed_field
     @property
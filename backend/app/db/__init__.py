@@ -1,2 +1,2 @@
 from app.db.base import Base
-from app.db.models import Admin, Nomination, Nominee, Setting, Vote  # noqa: F401
+from app.db.models import Admin, BotFsmState, Nomination, Nominee, NomineeVoteCount, Setting, UserVoteIndex, Vote  # noqa: F401
@@ -0,0 +1,125 @@
+import asyncio
+import hashlib
+import logging
+from collections.abc import Awaitable, Callable
+
+import asyncpg
+
+from app.core.config import settings
+from app.db.notifications import asyncpg_dsn
+
+logger = logging.getLogger(__name__)
+
+SingletonRunner = Callable[[], Awaitable[None]]
+
+
+def advisory_lock_key(name: str) -> int:
+    """Эта функция переводит имя синглтона в стабильный ключ advisory lock (bigint)."""
+
+    digest = hashlib.sha256(f"vrp:{name}".encode()).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+class LeaderElection:
+    """
+    Эти выборы лидера делают так, что каждую задачу-синглтон выполняет ровно один воркер.
+
+    Воркер держит отдельное соединение asyncpg и пытается взять сессионный advisory
+    lock на каждый зарегистрированный синглтон. Взявший блокировку запускает задачу.
+    Если воркер умирает, Postgres закрывает его соединение и снимает блокировки,
+    и на следующей попытке задачу подхватывает другой воркер. Потеряв соединение,
+    воркер сразу останавливает свои синглтоны: блокировки уже могут быть у других.
+    """
+
+    def __init__(self, dsn: str, retry_interval: float = 5.0) -> None:
+        self._dsn = dsn
+        self._retry_interval = retry_interval
+        self._runners: dict[str, SingletonRunner] = {}
+        self._held: dict[str, asyncio.Task] = {}
+        self._connection: asyncpg.Connection | None = None
+        self._task: asyncio.Task | None = None
+
+    def register(self, name: str, runner: SingletonRunner) -> None:
+        """Эта функция регистрирует задачу-синглтон; регистрироваться нужно до start()."""
+
+        self._runners[name] = runner
+
+    def held(self) -> list[str]:
+        """Эта функция отдаёт имена синглтонов, которые сейчас выполняет этот воркер."""
+
+        return sorted(self._held)
+
+    async def start(self) -> None:
+        """Эта функция запускает фоновые выборы, если есть зарегистрированные синглтоны."""
+
+        if self._task is None and self._runners:
+            self._task = asyncio.create_task(self._run(), name="leader-election")
+
+    async def stop(self) -> None:
+        """Эта функция останавливает синглтоны и отпускает блокировки, закрывая соединение."""
+
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        """Эта функция держит соединение и периодически пытается взять свободные синглтоны."""
+
+        while True:
+            try:
+                self._connection = await asyncpg.connect(self._dsn)
+                while True:
+                    await self._reap_finished()
+                    await self._acquire_free()
+                    # Ping заодно замечает обрыв соединения
+                    await self._connection.execute("SELECT 1")
+                    await asyncio.sleep(self._retry_interval)
+            except asyncio.CancelledError:
+                await self._release_all()
+                raise
+            except Exception as exc:
+                logger.warning("Leader election connection lost: %s", exc)
+                await self._release_all()
+            await asyncio.sleep(self._retry_interval)
+
+    async def _acquire_free(self) -> None:
+        """Эта функция пробует взять блокировку каждого синглтона, который ещё не у нас."""
+
+        for name, runner in self._runners.items():
+            if name in self._held:
+                continue
+            if await self._connection.fetchval("SELECT pg_try_advisory_lock($1)", advisory_lock_key(name)):
+                logger.info("Became leader for singleton %s", name)
+                self._held[name] = asyncio.create_task(runner(), name=f"singleton-{name}")
+
+    async def _reap_finished(self) -> None:
+        """Эта функция отпускает блокировки синглтонов, чья задача завершилась или упала."""
+
+        for name, task in list(self._held.items()):
+            if not task.done():
+                continue
+            del self._held[name]
+            if not task.cancelled() and task.exception() is not None:
+                logger.error("Singleton %s failed: %s", name, task.exception(), exc_info=task.exception())
+            await self._connection.execute("SELECT pg_advisory_unlock($1)", advisory_lock_key(name))
+
+    async def _release_all(self) -> None:
+        """Эта функция останавливает все свои синглтоны и закрывает соединение (и блокировки)."""
+
+        tasks = list(self._held.values())
+        self._held.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._connection is not None:
+            if not self._connection.is_closed():
+                self._connection.terminate()
+            self._connection = None
+
+
+leader_election = LeaderElection(asyncpg_dsn, retry_interval=settings.leader_retry_seconds)
@@ -1,5 +1,8 @@
 from app.db.models.admin import Admin  # noqa: F401
+from app.db.models.bot_fsm_state import BotFsmState  # noqa: F401
 from app.db.models.nomination import Nomination  # noqa: F401
 from app.db.models.nominee import Nominee  # noqa: F401
+from app.db.models.nominee_vote_count import NomineeVoteCount  # noqa: F401
 from app.db.models.setting import Setting  # noqa: F401
+from app.db.models.user_vote_index import UserVoteIndex  # noqa: F401
 from app.db.models.vote import Vote  # noqa: F401
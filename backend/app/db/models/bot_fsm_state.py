@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class BotFsmState(Base):
+    """
+    Эта модель хранит состояние диалога администратора с ботом (aiogram FSM).
+
+    Ключ собирается из ключа хранилища aiogram, данные лежат компактным JSON (orjson)
+    в bytea. Запись живёт до expires_at, после чего её удаляет фоновая очистка.
+    """
+
+    __tablename__ = "bot_fsm_state"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    state: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    data: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,22 @@
+from sqlalchemy import BigInteger, ForeignKey, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class NomineeVoteCount(Base):
+    """
+    Эта модель хранит шардированный счётчик голосов за номинанта.
+
+    На каждого номинанта приходится до vote_counter_shards строк: голос попадает
+    в шард по telegram_user_id, поэтому одновременные голоса за популярного
+    номинанта не выстраиваются в очередь на блокировку одной строки.
+    """
+
+    __tablename__ = "nominee_vote_count"
+
+    nominee_id: Mapped[int] = mapped_column(
+        ForeignKey("nominee.id", ondelete="CASCADE"), primary_key=True
+    )
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
@@ -0,0 +1,21 @@
+from sqlalchemy import BigInteger, Integer, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class UserVoteIndex(Base):
+    """
+    Эта модель хранит отсортированный список номинаций, в которых голосовал пользователь.
+
+    Одна строка на пользователя позволяет ответить «где я уже голосовал» без
+    обращения к таблице vote. Строка обновляется в той же транзакции, что и голос.
+    """
+
+    __tablename__ = "user_vote_index"
+
+    telegram_user_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    nomination_ids: Mapped[list[int]] = mapped_column(
+        ARRAY(Integer), nullable=False, server_default=text("'{}'")
+    )
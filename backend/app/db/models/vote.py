@@ -15,7 +15,7 @@ class Vote(Base):
     """Эта модель хранит каждый голос за номинанта."""
 
     __table_args__ = (
-        UniqueConstraint('telegram_user_id', 'nominee_id', name='unique_user_vote_per_nominee'),
+        UniqueConstraint('telegram_user_id', 'nomination_id', name='uq_vote_user_nomination'),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -23,7 +23,10 @@ class Vote(Base):
     nominee_id: Mapped[int] = mapped_column(
         ForeignKey("nominee.id", ondelete="CASCADE"), index=True, nullable=False
     )
+    # Денормализованная номинация: на ней держится правило «один голос на номинацию»
+    nomination_id: Mapped[int] = mapped_column(
+        ForeignKey("nomination.id", ondelete="CASCADE"), index=True, nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     nominee: Mapped["Nominee"] = relationship(back_populates="votes")
-
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NotificationHandler = Callable[[str], Awaitable[None]]
+
+
+class NotificationListener:
+    """
+    Этот слушатель держит отдельное соединение asyncpg и раздаёт NOTIFY подписчикам.
+
+    Каждый воркер держит одно такое соединение. При обрыве слушатель переподключается
+    и вызывает всех подписчиков с пустым payload: уведомления, отправленные пока
+    соединения не было, потеряны, и подписчикам нужно перечитать данные целиком.
+    """
+
+    def __init__(self, dsn: str, reconnect_delay: float = 2.0, ping_interval: float = 30.0) -> None:
+        self._dsn = dsn
+        self._reconnect_delay = reconnect_delay
+        self._ping_interval = ping_interval
+        self._handlers: dict[str, list[NotificationHandler]] = defaultdict(list)
+        self._task: asyncio.Task | None = None
+        self._connection: asyncpg.Connection | None = None
+        self._pending: set[asyncio.Task] = set()
+
+    def subscribe(self, channel: str, handler: NotificationHandler) -> None:
+        """Эта функция подписывает обработчик на канал; подписываться нужно до start()."""
+
+        self._handlers[channel].append(handler)
+
+    async def start(self) -> None:
+        """Эта функция запускает фоновое соединение для LISTEN."""
+
+        if self._task is None and self._handlers:
+            self._task = asyncio.create_task(self._run(), name="pg-notification-listener")
+
+    async def stop(self) -> None:
+        """Эта функция закрывает соединение и останавливает слушателя."""
+
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        """Эта функция держит соединение открытым и переподключается при обрыве."""
+
+        connected_before = False
+        while True:
+            try:
+                self._connection = await asyncpg.connect(self._dsn)
+                closed = asyncio.Event()
+                self._connection.add_termination_listener(lambda _: closed.set())
+                for channel in self._handlers:
+                    await self._connection.add_listener(channel, self._dispatch)
+                logger.info("Listening for NOTIFY on %s", ", ".join(self._handlers))
+
+                if connected_before:
+                    self._broadcast_resync()
+                connected_before = True
+
+                # Периодический ping замечает «тихий» обрыв сети
+                while not closed.is_set():
+                    try:
+                        await asyncio.wait_for(closed.wait(), self._ping_interval)
+                    except asyncio.TimeoutError:
+                        await self._connection.execute("SELECT 1")
+            except asyncio.CancelledError:
+                if self._connection is not None:
+                    await self._connection.close()
+                raise
+            except Exception as exc:
+                logger.warning("NOTIFY listener connection lost: %s", exc)
+            finally:
+                if self._connection is not None and not self._connection.is_closed():
+                    self._connection.terminate()
+                self._connection = None
+            await asyncio.sleep(self._reconnect_delay)
+
+    def _dispatch(self, connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        """Эта функция передаёт уведомление всем обработчикам канала."""
+
+        for handler in self._handlers.get(channel, ()):
+            self._spawn(handler, payload)
+
+    def _broadcast_resync(self) -> None:
+        """Эта функция просит всех подписчиков перечитать данные после переподключения."""
+
+        for handlers in self._handlers.values():
+            for handler in handlers:
+                self._spawn(handler, "")
+
+    def _spawn(self, handler: NotificationHandler, payload: str) -> None:
+        """Эта функция запускает обработчик в отдельной задаче и логирует его ошибки."""
+
+        async def call() -> None:
+            try:
+                await handler(payload)
+            except Exception as exc:
+                logger.error("NOTIFY handler %s failed: %s", handler.__qualname__, exc, exc_info=True)
+
+        task = asyncio.create_task(call())
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+
+async def notify(session: AsyncSession, channel: str, payload: str = "") -> None:
+    """Эта функция отправляет NOTIFY в транзакции сессии; подписчики получат его после коммита."""
+
+    await session.execute(select(func.pg_notify(channel, payload)))
+
+
+asyncpg_dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+notification_listener = NotificationListener(asyncpg_dsn)
@@ -1,15 +1,30 @@
-import asyncio
 import logging
 from pathlib import Path
+from typing import Any
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
 
 from app.api.router import get_api_router
 from app.core.config import settings
+from app.db.coordination import leader_election
+from app.db.notifications import notification_listener
+from app.services.admin_service import start_admins
+from app.services.background_jobs import run_media_gc, run_periodic_reconcile, run_scheduled_exports
+from app.services.catalog_service import start_catalog
+from app.services.results_stream import results_aggregator
+from app.services.settings_service import start_settings
+from app.services.user_votes_service import start_user_votes
+from app.services.vote_service import vote_ingest_buffer
 from app.telegram_bot.runner import start_polling
+from app.telegram_bot.storage import fsm_storage, run_fsm_sweeper
+from app.telegram_bot.webhook import router as telegram_webhook_router, telegram_webhook
+from app.utils.image_executor import image_executor
+from app.utils.json_response import ORJSONResponse
+from app.utils.media_store import MediaStaticFiles
+from app.utils.response_cache import response_cache
+from app.utils.single_flight import single_flight_metrics
+from app.utils.static_manifest import HASHED_PREFIX, INDEX_FILE, StaticManifest
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +32,7 @@ logger = logging.getLogger(__name__)
 def create_app() -> FastAPI:
     """Эта функция создаёт и настраивает экземпляр FastAPI."""
 
-    app = FastAPI(title=settings.app_name)
+    app = FastAPI(title=settings.app_name, default_response_class=ORJSONResponse)
 
     app.add_middleware(
         CORSMiddleware,
@@ -28,47 +43,95 @@ def create_app() -> FastAPI:
     )
 
     app.include_router(get_api_router())
+    app.include_router(telegram_webhook_router)
 
-    # Раздача медиафайлов (загруженные изображения)
+    # Раздача медиафайлов (загруженные изображения); блобы хранилища кэшируются навсегда
     media_dir = Path(settings.media_folder)
     media_dir.mkdir(parents=True, exist_ok=True)
-    app.mount("/media", StaticFiles(directory=str(media_dir)), name="media")
+    app.mount("/media", MediaStaticFiles(directory=str(media_dir)), name="media")
 
-    # Раздача статических файлов фронтенда
+    # Сборка фронтенда целиком читается в память при старте
     static_dir = Path(__file__).resolve().parent / "static"
-    if static_dir.exists():
-        app.mount("/assets", StaticFiles(directory=static_dir / "assets"), name="assets")
-        
-        @app.get("/{full_path:path}")
-        async def serve_spa(request: Request, full_path: str):
-            """Раздача SPA - все несуществующие роуты перенаправляем на index.html"""
-            # Если это API запрос, пропускаем
-            if full_path.startswith("api/") or full_path.startswith("media/"):
-                return {"detail": "Not Found"}
-            
-            # Проверяем, существует ли файл
-            file_path = static_dir / full_path
-            if file_path.is_file():
-                return FileResponse(file_path)
-            
-            # Для всех остальных путей возвращаем index.html (для SPA роутинга)
-            return FileResponse(static_dir / "index.html")
+    static_manifest = StaticManifest(static_dir) if (static_dir / INDEX_FILE).is_file() else None
 
     @app.on_event("startup")
     async def startup_event() -> None:
-        """Эта функция запускает Telegram-бота при старте приложения."""
-
-        if settings.telegram_bot_token:
-            logger.info("Starting Telegram bot...")
-            asyncio.create_task(start_polling())
+        """Эта функция запускает фоновые задачи и Telegram-бота при старте приложения."""
+
+        start_settings()
+        start_user_votes()
+        results_aggregator.start()
+        fsm_storage.start()
+        await start_catalog()
+        await start_admins()
+        await notification_listener.start()
+
+        if settings.vote_ingest_batched:
+            vote_ingest_buffer.start()
+
+        if settings.telegram_bot_token and settings.telegram_webhook_url:
+            logger.info("Starting Telegram bot (webhook)...")
+            await telegram_webhook.start()
+        elif settings.telegram_bot_token:
+            # Опрашивать Telegram должен ровно один воркер
+            logger.info("Starting Telegram bot (polling on the leader worker)...")
+            leader_election.register("telegram_polling", start_polling)
         else:
             logger.warning("TELEGRAM_BOT_TOKEN not set, bot will not start")
 
+        if settings.telegram_bot_token:
+            leader_election.register("fsm_sweeper", run_fsm_sweeper)
+        if settings.reconcile_interval_minutes:
+            leader_election.register("periodic_reconcile", run_periodic_reconcile)
+        if settings.export_interval_minutes:
+            leader_election.register("scheduled_exports", run_scheduled_exports)
+        if settings.media_gc_interval_minutes:
+            leader_election.register("media_gc", run_media_gc)
+        await leader_election.start()
+
+    @app.on_event("shutdown")
+    async def shutdown_event() -> None:
+        """Эта функция дописывает буфер голосов и закрывает фоновые соединения."""
+
+        await leader_election.stop()
+        await telegram_webhook.stop()
+        await vote_ingest_buffer.stop()
+        image_executor.stop()
+        await results_aggregator.stop()
+        await notification_listener.stop()
+
     @app.get("/health", tags=["health"])
-    async def health_check() -> dict[str, str]:
+    async def health_check() -> dict[str, Any]:
         """Этот эндпоинт говорит, что сервис жив и готов работать."""
 
-        return {"status": "ok"}
+        health: dict[str, Any] = {
+            "status": "ok",
+            "singletons": leader_election.held(),
+            "results_stream_subscribers": results_aggregator.subscribers,
+            "response_cache": response_cache.metrics(),
+            "single_flight": single_flight_metrics(),
+            "image_executor": image_executor.metrics(),
+        }
+        if telegram_webhook.running:
+            health["telegram_webhook"] = telegram_webhook.metrics()
+        if settings.vote_ingest_batched:
+            health["vote_ingest"] = vote_ingest_buffer.metrics()
+        return health
+
+    if static_manifest is not None:
+        # Объявляется последним, чтобы не перекрывать /health и другие маршруты
+        @app.get("/{full_path:path}", include_in_schema=False)
+        async def serve_spa(request: Request, full_path: str) -> Response:
+            """Раздача SPA из памяти - файлы сборки по пути, остальные маршруты получают index.html"""
+            asset = static_manifest.get(full_path)
+            if asset is not None:
+                return static_manifest.respond(request, asset)
+
+            # Неизвестные API, медиа и хэшированные файлы не подменяем страницей приложения
+            if full_path.startswith(("api/", "media/", HASHED_PREFIX)):
+                return ORJSONResponse({"detail": "Not Found"}, status_code=404)
+
+            return static_manifest.respond(request, static_manifest.index)
 
     return app
 
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class SessionTokenResponse(BaseModel):
+    """Схема для ответа с токеном сессии Mini App."""
+
+    token: str
+    expires_at: int
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+from app.schemas.nomination import NominationResponse
+from app.schemas.nominee import NomineeWithVotesResponse
+
+
+class BootstrapNominationResponse(NominationResponse):
+    """Схема для номинации вместе с её номинантами."""
+
+    nominees: list[NomineeWithVotesResponse]
+
+
+class BootstrapResponse(BaseModel):
+    """Схема для стартового состояния Mini App одним ответом."""
+
+    nominations: list[BootstrapNominationResponse]
+    voting_open: bool
+    voted_nomination_ids: list[int]
@@ -1,6 +1,8 @@
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict, field_serializer
+from pydantic import BaseModel, ConfigDict, Field, computed_field, field_serializer
+
+from app.utils.media import media_srcset, media_url
 
 
 class NominationBase(BaseModel):
@@ -21,13 +23,18 @@ class NominationResponse(NominationBase):
 
     id: int
     created_at: datetime
+    image_formats: list[str] = Field(default_factory=list, exclude=True)
 
     @field_serializer('image_path')
     def serialize_image_path(self, image_path: str) -> str:
         """Преобразует относительный путь в полный URL."""
-        if image_path.startswith('/') or image_path.startswith('http'):
-            return image_path
-        return f"/media/{image_path}"
+        return media_url(image_path)
+
+    @computed_field
+    @property
+    def image_srcset(self) -> dict[str, str]:
+        """Это srcset уменьшенных копий изображения по форматам (avif, webp)."""
+        return media_srcset(self.image_path, self.image_formats)
 
     model_config = ConfigDict(from_attributes=True)
 
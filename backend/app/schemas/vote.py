@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class VoteCreate(BaseModel):
@@ -8,6 +8,12 @@ class VoteCreate(BaseModel):
     nomination_id: int  # Для проверки - один голос на номинацию
 
 
+class VoteBatchCreate(BaseModel):
+    """Схема для пакетного голосования сразу в нескольких номинациях."""
+
+    votes: list[VoteCreate] = Field(min_length=1, max_length=100)
+
+
 class VoteResponse(BaseModel):
     """Схема для ответа после голосования."""
 
@@ -17,3 +23,14 @@ class VoteResponse(BaseModel):
     vote_count: int
     already_voted: bool = False
 
+
+class VoteBatchResponse(BaseModel):
+    """Схема для ответа на пакетное голосование: по ответу на каждый голос."""
+
+    results: list[VoteResponse]
+
+
+class VotedNominationsResponse(BaseModel):
+    """Схема для списка номинаций, в которых пользователь уже голосовал."""
+
+    nomination_ids: list[int]
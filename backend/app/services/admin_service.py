@@ -1,25 +1,78 @@
-from sqlalchemy import select
+import asyncio
+import logging
+import time
+
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.db.models import Admin
+from app.db.notifications import notification_listener, notify
+from app.db.session import async_session_factory
+
+logger = logging.getLogger(__name__)
+
+ADMINS_CHANNEL = "vrp_admins"
+
+# Множество администраторов: settings.admin_ids плюс таблица admin
+_admin_ids: frozenset[int] | None = None
+# Момент устаревания множества по time.monotonic
+_expires_at = 0.0
+_reload_lock = asyncio.Lock()
+
+
+async def reload_admins() -> frozenset[int]:
+    """Эта функция перечитывает администраторов из БД и атомарно подменяет множество."""
+
+    global _admin_ids, _expires_at
+
+    async with _reload_lock:
+        async with async_session_factory() as session:
+            result = await session.execute(select(Admin.telegram_id))
+            _admin_ids = frozenset(settings.admin_ids).union(result.scalars().all())
+        _expires_at = time.monotonic() + settings.admin_cache_ttl_seconds
+        logger.info("Admin set loaded: %s admins", len(_admin_ids))
+        return _admin_ids
+
+
+async def get_admin_ids() -> frozenset[int]:
+    """
+    Эта функция отдаёт множество администраторов, загружая его при первом обращении.
+
+    Множество сбрасывается по NOTIFY от любого писателя, а TTL admin_cache_ttl_seconds
+    ограничивает время расхождения, если уведомление потерялось.
+    """
+
+    if _admin_ids is None or time.monotonic() >= _expires_at:
+        return await reload_admins()
+    return _admin_ids
+
+
+def invalidate_admins() -> None:
+    """Эта функция сбрасывает множество администраторов: следующая проверка перечитает его из БД."""
+
+    global _admin_ids
 
+    _admin_ids = None
 
-async def is_admin(session: AsyncSession, telegram_id: int) -> bool:
-    """Эта функция проверяет, является ли пользователь администратором."""
 
-    # Сначала проверяем список из настроек
+async def is_admin(telegram_id: int) -> bool:
+    """Эта функция проверяет, является ли пользователь администратором (из памяти)."""
+
+    # Сначала проверяем список из настроек: он не требует БД
     if telegram_id in settings.admin_ids:
         return True
 
-    # Затем проверяем базу данных
-    result = await session.execute(select(Admin).where(Admin.telegram_id == telegram_id))
-    admin = result.scalar_one_or_none()
-    return admin is not None
+    return telegram_id in await get_admin_ids()
 
 
 async def add_admin(session: AsyncSession, telegram_id: int) -> Admin:
-    """Эта функция добавляет администратора в базу данных."""
+    """
+    Эта функция добавляет администратора в базу данных.
+
+    NOTIFY уходит в той же транзакции, поэтому остальные воркеры сбросят множество
+    администраторов после коммита, а текущий — сразу.
+    """
 
     result = await session.execute(select(Admin).where(Admin.telegram_id == telegram_id))
     admin = result.scalar_one_or_none()
@@ -28,7 +81,43 @@ async def add_admin(session: AsyncSession, telegram_id: int) -> Admin:
 
     admin = Admin(telegram_id=telegram_id)
     session.add(admin)
+    await notify(session, ADMINS_CHANNEL)
     await session.commit()
     await session.refresh(admin)
+    invalidate_admins()
     return admin
 
+
+async def remove_admin(session: AsyncSession, telegram_id: int) -> bool:
+    """
+    Эта функция удаляет администратора из базы данных.
+
+    Администраторы из settings.admin_ids задаются настройками и так не удаляются.
+    Возвращает False, если такого администратора в БД не было.
+    """
+
+    result = await session.execute(delete(Admin).where(Admin.telegram_id == telegram_id))
+    if not result.rowcount:
+        return False
+
+    await notify(session, ADMINS_CHANNEL)
+    await session.commit()
+    invalidate_admins()
+    return True
+
+
+async def _on_admins_changed(payload: str) -> None:
+    """Этот обработчик сбрасывает множество администраторов по уведомлению из другого воркера."""
+
+    invalidate_admins()
+
+
+async def start_admins() -> None:
+    """Эта функция подписывает множество администраторов на уведомления и загружает его."""
+
+    notification_listener.subscribe(ADMINS_CHANNEL, _on_admins_changed)
+    try:
+        await reload_admins()
+    except Exception as exc:
+        # Множество загрузится при первой проверке, когда база станет доступна
+        logger.warning("Admin set preload failed: %s", exc)
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.core.config import settings
+from app.db.session import async_session_factory
+from app.services.export_service import export_votes_columnar
+from app.services.media_service import collect_media_garbage
+from app.services.user_votes_service import rebuild_user_vote_index
+from app.services.vote_count_service import reconcile_vote_counts
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodic_reconcile() -> None:
+    """
+    Эта задача-синглтон периодически пересобирает счётчики и индекс голосов пользователей.
+
+    Запускается только на воркере-лидере, интервал — reconcile_interval_minutes.
+    """
+
+    while True:
+        await asyncio.sleep(settings.reconcile_interval_minutes * 60)
+        async with async_session_factory() as session:
+            nominees = await reconcile_vote_counts(session)
+        async with async_session_factory() as session:
+            users = await rebuild_user_vote_index(session)
+        logger.info("Periodic reconcile done: %s nominees, %s users", nominees, users)
+
+
+async def run_scheduled_exports() -> None:
+    """
+    Эта задача-синглтон по расписанию кладёт выгрузку голосов по колонкам в export_folder.
+
+    Запускается только на воркере-лидере, интервал — export_interval_minutes.
+    """
+
+    folder = Path(settings.export_folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    while True:
+        await asyncio.sleep(settings.export_interval_minutes * 60)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+        rows = await export_votes_columnar(folder / f"votes-{stamp}.zip")
+        logger.info("Scheduled export done: %s votes", rows)
+
+
+async def run_media_gc() -> None:
+    """
+    Эта задача-синглтон периодически удаляет из каталога медиа файлы без ссылок в БД.
+
+    Запускается только на воркере-лидере, интервал — media_gc_interval_minutes.
+    """
+
+    while True:
+        await asyncio.sleep(settings.media_gc_interval_minutes * 60)
+        async with async_session_factory() as session:
+            removed = await collect_media_garbage(session, settings.media_gc_grace_seconds)
+        if removed:
+            logger.info("Media GC removed %s unreferenced files", removed)
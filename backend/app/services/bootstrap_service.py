@@ -0,0 +1,69 @@
+import json
+from collections import defaultdict
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Nominee
+from app.services.catalog_service import get_catalog
+from app.services.nomination_service import get_nomination_rows
+from app.services.nominee_service import NOMINEE_COLUMNS, nominee_row_to_dict
+from app.services.results_stream import results_aggregator
+from app.services.settings_service import is_voting_open
+from app.services.user_votes_service import get_voted_nominations
+from app.services.vote_count_service import vote_totals
+from app.utils.json_response import dumps
+from app.utils.single_flight import single_flight
+
+# Общая часть ответа: (версия данных, JSON-массив номинаций с номинантами)
+_shared: tuple[tuple[int, int], bytes] | None = None
+
+
+@single_flight
+async def _encode_nominations(session: AsyncSession) -> bytes:
+    """Эта функция собирает номинации с номинантами и голосами и кодирует их в JSON."""
+
+    nominations = await get_nomination_rows(session)
+
+    totals = vote_totals()
+    nominees = await session.execute(
+        select(*NOMINEE_COLUMNS, func.coalesce(totals.c.vote_count, 0).label("vote_count"))
+        .outerjoin(totals, totals.c.nominee_id == Nominee.id)
+        .order_by(Nominee.created_at)
+    )
+    nominees_by_nomination: defaultdict[int, list[dict[str, Any]]] = defaultdict(list)
+    for row in nominees.all():
+        nominees_by_nomination[row.nomination_id].append(nominee_row_to_dict(row, row.vote_count))
+
+    return dumps(
+        [{**nomination, "nominees": nominees_by_nomination[nomination["id"]]} for nomination in nominations]
+    )
+
+
+async def get_shared_bootstrap(session: AsyncSession) -> bytes:
+    """
+    Эта функция отдаёт общую для всех пользователей часть стартового состояния.
+
+    JSON кодируется один раз на версию каталога и тик голосования, дальше
+    каждый запрос получает те же байты.
+    """
+
+    global _shared
+
+    catalog = await get_catalog()
+    version = (catalog.version, results_aggregator.results_version)
+    if _shared is None or _shared[0] != version:
+        _shared = (version, await _encode_nominations(session))
+    return _shared[1]
+
+
+async def encode_bootstrap(session: AsyncSession, telegram_user_id: int) -> bytes:
+    """Эта функция дописывает к общей части флаг голосования и номинации пользователя."""
+
+    nominations = await get_shared_bootstrap(session)
+    voting_open = await is_voting_open(session)
+    voted = sorted(await get_voted_nominations(session, telegram_user_id))
+    personal = json.dumps({"voting_open": voting_open, "voted_nomination_ids": voted}, separators=(",", ":"))
+    # Склеиваем готовые байты вместо повторной сериализации номинаций
+    return b'{"nominations":' + nominations + b"," + personal[1:].encode()
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Nominee
+from app.db.notifications import notification_listener, notify
+from app.db.session import async_session_factory
+
+logger = logging.getLogger(__name__)
+
+CATALOG_CHANNEL = "vrp_catalog"
+
+
+class CatalogNominee:
+    """Эта запись каталога хранит только то, что нужно для приёма голоса."""
+
+    __slots__ = ("nomination_id", "name")
+
+    def __init__(self, nomination_id: int, name: str) -> None:
+        self.nomination_id = nomination_id
+        self.name = name
+
+
+class Catalog:
+    """
+    Этот снимок каталога отображает ID номинанта в его номинацию и имя.
+
+    Снимок неизменяем: при любой правке в боте собирается новый снимок со следующей
+    версией и целиком подменяет старый, поэтому читатели никогда не видят его
+    наполовину обновлённым.
+    """
+
+    __slots__ = ("version", "nominees")
+
+    def __init__(self, version: int, nominees: Mapping[int, CatalogNominee]) -> None:
+        self.version = version
+        self.nominees = MappingProxyType(dict(nominees))
+
+    def find_nominee(self, nominee_id: int, nomination_id: int) -> CatalogNominee | None:
+        """Эта функция находит номинанта, только если он принадлежит указанной номинации."""
+
+        nominee = self.nominees.get(nominee_id)
+        if nominee is None or nominee.nomination_id != nomination_id:
+            return None
+        return nominee
+
+
+_catalog: Catalog | None = None
+_reload_lock = asyncio.Lock()
+
+
+async def reload_catalog() -> Catalog:
+    """Эта функция перечитывает каталог из БД и атомарно подменяет снимок."""
+
+    global _catalog
+
+    async with _reload_lock:
+        async with async_session_factory() as session:
+            result = await session.execute(select(Nominee.id, Nominee.nomination_id, Nominee.name))
+            nominees = {
+                nominee_id: CatalogNominee(nomination_id, name)
+                for nominee_id, nomination_id, name in result.all()
+            }
+
+        version = _catalog.version + 1 if _catalog is not None else 1
+        _catalog = Catalog(version, nominees)
+        logger.info("Catalog v%s loaded: %s nominees", version, len(nominees))
+        return _catalog
+
+
+async def get_catalog() -> Catalog:
+    """Эта функция отдаёт текущий снимок каталога, загружая его при первом обращении."""
+
+    if _catalog is None:
+        return await reload_catalog()
+    return _catalog
+
+
+async def commit_catalog_change(session: AsyncSession) -> None:
+    """
+    Эта функция фиксирует правку номинаций или номинантов и обновляет каталог.
+
+    NOTIFY уходит в той же транзакции, поэтому остальные воркеры узнают о правке
+    только после коммита, а текущий воркер перечитывает каталог сразу.
+    """
+
+    await notify(session, CATALOG_CHANNEL)
+    await session.commit()
+    await reload_catalog()
+
+
+async def _on_catalog_changed(payload: str) -> None:
+    """Этот обработчик перечитывает каталог по уведомлению из другого воркера."""
+
+    await reload_catalog()
+
+
+async def start_catalog() -> None:
+    """Эта функция подписывает каталог на уведомления и загружает первый снимок."""
+
+    notification_listener.subscribe(CATALOG_CHANNEL, _on_catalog_changed)
+    try:
+        await reload_catalog()
+    except Exception as exc:
+        # Каталог загрузится при первом голосе, когда база станет доступна
+        logger.warning("Catalog preload failed: %s", exc)
@@ -0,0 +1,171 @@
+import asyncio
+import csv
+import io
+import tempfile
+import zlib
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+from sqlalchemy import Row, Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import Nomination, Nominee, Vote
+from app.db.session import async_session_factory
+from app.services.vote_count_service import vote_totals
+from app.utils.columnar import ColumnarWriter, zip_columns
+
+ExportMode = Literal["aggregate", "raw"]
+
+EXPORT_HEADERS: dict[ExportMode, list[str]] = {
+    "aggregate": ["Номинация", "Номинант", "Голосов"],
+    "raw": ["ID голоса", "Время", "Telegram ID", "ID номинации", "Номинация", "ID номинанта", "Номинант"],
+}
+
+
+# Колонки выгрузки голосов для анализа и их типы NumPy
+VOTE_COLUMN_DTYPES: dict[str, np.dtype] = {
+    "telegram_user_id": np.dtype(np.int64),
+    "nominee_id": np.dtype(np.int32),
+    "nomination_id": np.dtype(np.int32),
+    "created_at": np.dtype("datetime64[us]"),
+}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _aggregate_query() -> Select:
+    """Эта функция строит запрос итогов: номинация, номинант, число голосов."""
+
+    totals = vote_totals()
+    vote_count = func.coalesce(totals.c.vote_count, 0)
+    return (
+        select(Nomination.title, Nominee.name, vote_count)
+        .join(Nominee, Nominee.nomination_id == Nomination.id)
+        .outerjoin(totals, totals.c.nominee_id == Nominee.id)
+        .order_by(Nomination.created_at, Nomination.id, vote_count.desc(), Nominee.created_at)
+    )
+
+
+def _raw_query() -> Select:
+    """Эта функция строит запрос всех голосов с названиями номинаций и именами номинантов."""
+
+    return (
+        select(
+            Vote.id,
+            Vote.created_at,
+            Vote.telegram_user_id,
+            Vote.nomination_id,
+            Nomination.title,
+            Vote.nominee_id,
+            Nominee.name,
+        )
+        .join(Nominee, Nominee.id == Vote.nominee_id)
+        .join(Nomination, Nomination.id == Vote.nomination_id)
+        .order_by(Vote.id)
+    )
+
+
+async def has_export_rows(session: AsyncSession, mode: ExportMode) -> bool:
+    """Эта функция проверяет, что в выгрузке будет хотя бы одна строка кроме заголовка."""
+
+    query = _aggregate_query() if mode == "aggregate" else _raw_query()
+    return bool((await session.execute(select(query.order_by(None).exists()))).scalar())
+
+
+def export_filename(mode: ExportMode, compress: bool) -> str:
+    """Эта функция формирует имя файла выгрузки."""
+
+    name = "results.csv" if mode == "aggregate" else "votes.csv"
+    return f"{name}.gz" if compress else name
+
+
+async def iter_export_csv(mode: ExportMode, compress: bool = False) -> AsyncIterator[bytes]:
+    """
+    Эта функция отдаёт CSV-выгрузку кусками по мере чтения из БД.
+
+    Строки читаются серверным курсором пачками по export_chunk_rows, и каждая пачка
+    сразу превращается в байты (и при compress — в поток gzip). В памяти одновременно
+    лежит только одна пачка, сколько бы голосов ни было в таблице. Сессия открывается
+    внутри генератора, поэтому его можно отдавать в StreamingResponse.
+    """
+
+    query = _aggregate_query() if mode == "aggregate" else _raw_query()
+    compressor = zlib.compressobj(level=6, wbits=31) if compress else None
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def take() -> bytes:
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        return compressor.compress(data) if compressor else data
+
+    writer.writerow(EXPORT_HEADERS[mode])
+    async with async_session_factory() as session:
+        result = await session.stream(query.execution_options(yield_per=settings.export_chunk_rows))
+        async for partition in result.partitions():
+            writer.writerows(partition)
+            if chunk := take():
+                yield chunk
+
+    if chunk := take():
+        yield chunk
+    if compressor:
+        yield compressor.flush()
+
+
+def _append_votes(writer: ColumnarWriter, partition: Sequence[Row]) -> None:
+    """Эта функция раскладывает пачку голосов по колонкам и дописывает её в выгрузку."""
+
+    telegram_user_ids, nominee_ids, nomination_ids, created_at = zip(*partition)
+    writer.append(
+        {
+            "telegram_user_id": telegram_user_ids,
+            "nominee_id": nominee_ids,
+            "nomination_id": nomination_ids,
+            # Микросекунды от эпохи без потерь точности float
+            "created_at": np.fromiter(
+                ((moment - _EPOCH) // _MICROSECOND for moment in created_at),
+                dtype=np.int64,
+                count=len(created_at),
+            ).view("datetime64[us]"),
+        }
+    )
+
+
+async def export_votes_columnar(zip_path: Path) -> int:
+    """
+    Эта функция выгружает таблицу vote по колонкам: zip с файлами .npy на каждую колонку.
+
+    Подсчёт строк и чтение идут в одном снимке (REPEATABLE READ), поэтому заголовки
+    файлов пишутся заранее по точному числу строк. Голоса читаются серверным курсором
+    пачками по export_chunk_rows; время голоса хранится как datetime64[us] в UTC.
+    Открывать выгрузку нужно через app.utils.columnar.load_columns.
+    Возвращает число выгруженных голосов.
+    """
+
+    with tempfile.TemporaryDirectory() as directory:
+        async with async_session_factory() as session:
+            await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            rows = (await session.execute(select(func.count()).select_from(Vote))).scalar_one()
+            writer = await asyncio.to_thread(ColumnarWriter, Path(directory), VOTE_COLUMN_DTYPES, rows)
+
+            query = (
+                select(Vote.telegram_user_id, Vote.nominee_id, Vote.nomination_id, Vote.created_at)
+                .order_by(Vote.id)
+                .execution_options(yield_per=settings.export_chunk_rows)
+            )
+            result = await session.stream(query)
+            async for partition in result.partitions():
+                # Преобразование и запись в memmap — работа процессора и диска, не цикла событий
+                await asyncio.to_thread(_append_votes, writer, partition)
+
+        paths = writer.paths
+        await asyncio.to_thread(writer.close)
+        await asyncio.to_thread(zip_columns, paths, zip_path)
+    return rows
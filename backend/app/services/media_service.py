@@ -0,0 +1,203 @@
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+
+from sqlalchemy import select, union, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import Nomination, Nominee
+from app.services.catalog_service import commit_catalog_change
+from app.utils.image_derivatives import (
+    DERIVATIVE_FORMATS,
+    DERIVATIVE_SIZES,
+    built_formats,
+    derivative_dir,
+    derivative_path,
+    render_derivatives,
+    write_derivatives,
+)
+from app.utils.image_executor import image_executor
+from app.utils.media_store import BLOB_PREFIX, DERIVATIVE_PREFIX, is_blob_path, store_blob
+
+logger = logging.getLogger(__name__)
+
+
+def _save_image_files(image_data: bytes, suffix: str, derivatives: dict[str, bytes]) -> tuple[str, list[str]]:
+    """Эта функция кладёт изображение в хранилище блобов и рядом его производные."""
+
+    media_root = Path(settings.media_folder)
+    image_path = store_blob(media_root, image_data, suffix)
+    write_derivatives(media_root, image_path, derivatives)
+    return image_path, built_formats(derivatives)
+
+
+async def save_uploaded_image(
+    image_data: bytes, suffix: str, derivatives: dict[str, bytes]
+) -> tuple[str, list[str]]:
+    """
+    Эта функция сохраняет загруженное изображение и возвращает значения image_path и image_formats.
+
+    Файл называется по SHA-256 содержимого, поэтому замена фото даёт новый URL,
+    а старый файл остаётся на месте до сборки мусора.
+    """
+
+    return await asyncio.to_thread(_save_image_files, image_data, suffix, derivatives)
+
+
+async def _referenced_image_paths(session: AsyncSession) -> list[str]:
+    """Эта функция отдаёт пути всех изображений, на которые ссылаются номинации и номинанты."""
+
+    result = await session.execute(union(select(Nomination.image_path), select(Nominee.image_path)))
+    return [image_path for (image_path,) in result.all() if not image_path.startswith(("/", "http"))]
+
+
+def _formats_on_disk(media_root: Path, image_path: str) -> list[str]:
+    """Эта функция отдаёт форматы, копии всех размеров которых уже лежат на диске."""
+
+    return [
+        fmt
+        for fmt in DERIVATIVE_FORMATS
+        if all((media_root / derivative_path(image_path, size, fmt)).is_file() for size in DERIVATIVE_SIZES)
+    ]
+
+
+async def _set_image_formats(session: AsyncSession, image_formats: dict[str, list[str]]) -> None:
+    """Эта функция записывает построенные форматы в номинации и номинантов с этими изображениями."""
+
+    for model in (Nomination, Nominee):
+        for image_path, formats in image_formats.items():
+            await session.execute(
+                update(model).where(model.image_path == image_path).values(image_formats=formats)
+            )
+
+
+async def backfill_derivatives(session: AsyncSession, force: bool = False) -> tuple[int, int, int]:
+    """
+    Эта функция строит недостающие производные для всех изображений номинаций и номинантов.
+
+    Изображения обрабатываются в пуле процессов не больше image_workers одновременно.
+    Построенные форматы записываются в image_formats, поэтому API начинает отдавать
+    srcset только после этого. Возвращает (построено, пропущено, ошибок); с force
+    производные строятся заново.
+    """
+
+    image_paths = await _referenced_image_paths(session)
+    media_root = Path(settings.media_folder)
+    semaphore = asyncio.Semaphore(settings.image_workers)
+    counts = {"rendered": 0, "skipped": 0, "failed": 0}
+    image_formats: dict[str, list[str]] = {}
+
+    async def backfill_one(image_path: str) -> None:
+        async with semaphore:
+            if not force:
+                formats = await asyncio.to_thread(_formats_on_disk, media_root, image_path)
+                if formats == list(DERIVATIVE_FORMATS):
+                    image_formats[image_path] = formats
+                    counts["skipped"] += 1
+                    return
+            try:
+                image_data = await asyncio.to_thread((media_root / image_path).read_bytes)
+                derivatives = await image_executor.run(render_derivatives, image_data)
+                await asyncio.to_thread(write_derivatives, media_root, image_path, derivatives)
+            except Exception as exc:
+                logger.warning("Failed to build derivatives for %s: %s", image_path, exc)
+                counts["failed"] += 1
+                return
+            image_formats[image_path] = built_formats(derivatives)
+            counts["rendered"] += 1
+
+    await asyncio.gather(*(backfill_one(image_path) for image_path in image_paths))
+    if image_formats:
+        await _set_image_formats(session, image_formats)
+        await commit_catalog_change(session)
+    return counts["rendered"], counts["skipped"], counts["failed"]
+
+
+def _remove_unreferenced(media_root: Path, keep_files: set[str], keep_dirs: set[str], grace_seconds: float) -> int:
+    """
+    Эта функция удаляет файлы хранилища без ссылок, которые не менялись дольше grace_seconds.
+
+    Обходятся только blobs/ и derived/blobs/: остальное содержимое каталога медиа
+    хранилищу не принадлежит и не трогается.
+    """
+
+    removed = 0
+    deadline = time.time() - grace_seconds
+    for store_root in (media_root / BLOB_PREFIX, media_root / DERIVATIVE_PREFIX / BLOB_PREFIX):
+        for dirpath, _, filenames in os.walk(store_root, topdown=False):
+            directory = Path(dirpath)
+            relative_dir = directory.relative_to(media_root).as_posix()
+            if relative_dir in keep_dirs:
+                continue
+            for file_name in filenames:
+                path = directory / file_name
+                relative_path = path.relative_to(media_root).as_posix()
+                if relative_path in keep_files:
+                    continue
+                try:
+                    # Свежие файлы могут принадлежать загрузке, ссылка на которую ещё не зафиксирована
+                    if path.stat().st_mtime > deadline:
+                        continue
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+                removed += 1
+            if directory != store_root and not any(directory.iterdir()) and directory.stat().st_mtime <= deadline:
+                try:
+                    directory.rmdir()
+                except OSError:
+                    # В каталог как раз пишет новая загрузка
+                    pass
+    return removed
+
+
+async def collect_media_garbage(session: AsyncSession, grace_seconds: float) -> int:
+    """
+    Эта функция удаляет из хранилища блобов изображения и производные, на которые нет ссылок в БД.
+
+    Файлы моложе grace_seconds не трогаются: так не пострадает загрузка, которая
+    уже записала блоб, но ещё не зафиксировала номинанта. Возвращает число удалённых файлов.
+    """
+
+    image_paths = await _referenced_image_paths(session)
+    keep_dirs = {derivative_dir(image_path) for image_path in image_paths}
+    return await asyncio.to_thread(
+        _remove_unreferenced, Path(settings.media_folder), set(image_paths), keep_dirs, grace_seconds
+    )
+
+
+async def migrate_legacy_media(session: AsyncSession) -> int:
+    """
+    Эта функция переносит изображения со старыми именами в хранилище блобов.
+
+    Пути в БД обновляются одной транзакцией; старые файлы остаются на месте,
+    сборщик мусора их не трогает.
+    Возвращает число перенесённых изображений.
+    """
+
+    media_root = Path(settings.media_folder)
+    moved: dict[str, tuple[str, list[str]]] = {}
+    for image_path in await _referenced_image_paths(session):
+        if is_blob_path(image_path):
+            continue
+        source = media_root / image_path
+        if not await asyncio.to_thread(source.is_file):
+            logger.warning("Image %s is referenced but missing on disk", image_path)
+            continue
+        image_data = await asyncio.to_thread(source.read_bytes)
+        derivatives = await image_executor.run(render_derivatives, image_data)
+        moved[image_path] = await save_uploaded_image(image_data, source.suffix or ".jpg", derivatives)
+
+    if moved:
+        for model in (Nomination, Nominee):
+            for old_path, (new_path, formats) in moved.items():
+                await session.execute(
+                    update(model)
+                    .where(model.image_path == old_path)
+                    .values(image_path=new_path, image_formats=formats)
+                )
+        await commit_catalog_change(session)
+    return len(moved)
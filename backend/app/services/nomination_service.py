@@ -1,8 +1,11 @@
+from typing import Any
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models import Nomination
 from app.schemas.nomination import NominationCreate, NominationResponse
+from app.utils.media import media_srcset, media_url
 
 
 async def get_all_nominations(session: AsyncSession) -> list[NominationResponse]:
@@ -13,6 +16,27 @@ async def get_all_nominations(session: AsyncSession) -> list[NominationResponse]
     return [NominationResponse.model_validate(n) for n in nominations]
 
 
+async def get_nomination_rows(session: AsyncSession) -> list[dict[str, Any]]:
+    """Эта функция получает номинации готовыми к JSON словарями в форме NominationResponse."""
+
+    result = await session.execute(
+        select(
+            Nomination.id, Nomination.title, Nomination.image_path, Nomination.image_formats, Nomination.created_at
+        )
+        .order_by(Nomination.created_at)
+    )
+    return [
+        {
+            "title": row.title,
+            "image_path": media_url(row.image_path),
+            "id": row.id,
+            "created_at": row.created_at,
+            "image_srcset": media_srcset(row.image_path, row.image_formats),
+        }
+        for row in result.all()
+    ]
+
+
 async def get_nomination_by_id(session: AsyncSession, nomination_id: int) -> NominationResponse | None:
     """Эта функция получает номинацию по ID."""
 
@@ -1,46 +1,56 @@
-from sqlalchemy import func, select
+from typing import Any
+
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import Nominee, Vote
-from app.schemas.nominee import NomineeWithVotesResponse
+from app.db.models import Nominee
+from app.services.vote_count_service import vote_count_for
+from app.utils.media import media_srcset, media_url
+from app.utils.single_flight import single_flight
 
+# Колонки номинанта для лёгкого пути чтения (без ORM-объектов)
+NOMINEE_COLUMNS = (
+    Nominee.id,
+    Nominee.nomination_id,
+    Nominee.name,
+    Nominee.image_path,
+    Nominee.image_formats,
+    Nominee.created_at,
+)
 
-async def get_nominees_by_nomination(
-    session: AsyncSession, nomination_id: int
-) -> list[NomineeWithVotesResponse]:
-    """Эта функция получает список номинантов по номинации с количеством голосов."""
 
-    # Подзапрос для подсчёта голосов
-    vote_count_subquery = (
-        select(func.count(Vote.id).label("vote_count"))
-        .where(Vote.nominee_id == Nominee.id)
-        .scalar_subquery()
-    )
+def nominee_row_to_dict(row: Row, vote_count: int) -> dict[str, Any]:
+    """Эта функция превращает строку с колонками NOMINEE_COLUMNS в словарь ответа NomineeWithVotesResponse."""
+
+    return {
+        "id": row.id,
+        "nomination_id": row.nomination_id,
+        "name": row.name,
+        "image_path": media_url(row.image_path),
+        "created_at": row.created_at,
+        "image_srcset": media_srcset(row.image_path, row.image_formats),
+        "vote_count": vote_count,
+    }
+
+
+@single_flight
+async def get_nominees_by_nomination(session: AsyncSession, nomination_id: int) -> list[dict[str, Any]]:
+    """
+    Эта функция получает список номинантов по номинации с количеством голосов.
+
+    Возвращает готовые к JSON словари в форме NomineeWithVotesResponse: строки
+    выбираются колонками, без ORM-объектов и валидации Pydantic на каждую строку.
+    """
+
+    # Подзапрос суммирует шарды счётчика вместо подсчёта голосов
+    vote_count_subquery = vote_count_for(Nominee.id)
 
     result = await session.execute(
-        select(
-            Nominee,
-            func.coalesce(vote_count_subquery, 0).label("vote_count"),
-        )
+        select(*NOMINEE_COLUMNS, vote_count_subquery.label("vote_count"))
         .where(Nominee.nomination_id == nomination_id)
         .order_by(Nominee.created_at)
     )
-
-    nominees_with_votes = []
-    for row in result.all():
-        nominee = row[0]
-        vote_count = row[1]
-        nominee_dict = {
-            "id": nominee.id,
-            "nomination_id": nominee.nomination_id,
-            "name": nominee.name,
-            "image_path": nominee.image_path,
-            "created_at": nominee.created_at,
-            "vote_count": vote_count,
-        }
-        nominees_with_votes.append(NomineeWithVotesResponse(**nominee_dict))
-
-    return nominees_with_votes
+    return [nominee_row_to_dict(row, row.vote_count) for row in result.all()]
 
 
 async def get_nominee_by_id(session: AsyncSession, nominee_id: int) -> Nominee | None:
@@ -48,4 +58,3 @@ async def get_nominee_by_id(session: AsyncSession, nominee_id: int) -> Nominee |
 
     result = await session.execute(select(Nominee).where(Nominee.id == nominee_id))
     return result.scalar_one_or_none()
-
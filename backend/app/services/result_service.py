@@ -1,72 +1,87 @@
-from sqlalchemy import func, select
+from itertools import groupby
+from typing import Any
+
+from sqlalchemy import Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import Nomination, Nominee, Vote
-from app.schemas.nominee import NomineeWithVotesResponse
+from app.db.models import Nomination, Nominee
 from app.schemas.result import NominationResultResponse, ResultsSummaryResponse
+from app.services.nominee_service import NOMINEE_COLUMNS, nominee_row_to_dict
+from app.services.vote_count_service import vote_totals
+from app.utils.single_flight import single_flight
 
 
-async def get_results_by_nomination(
-    session: AsyncSession, nomination_id: int
-) -> NominationResultResponse | None:
-    """Эта функция получает результаты по конкретной номинации, отсортированные по убыванию голосов."""
+def _results_query() -> Select:
+    """
+    Эта функция строит запрос результатов: номинации, их номинанты и голоса.
 
-    # Получаем номинацию
-    result = await session.execute(select(Nomination).where(Nomination.id == nomination_id))
-    nomination = result.scalar_one_or_none()
-    if not nomination:
-        return None
-
-    # Подзапрос для подсчёта голосов
-    vote_count_subquery = (
-        select(func.count(Vote.id).label("vote_count"))
-        .where(Vote.nominee_id == Nominee.id)
-        .scalar_subquery()
-    )
+    Номинации без номинантов попадают в выборку благодаря LEFT JOIN, а места
+    внутри номинации считает оконная функция rank().
+    """
+
+    totals = vote_totals()
+    vote_count = func.coalesce(totals.c.vote_count, 0).label("vote_count")
+    place = func.rank().over(partition_by=Nomination.id, order_by=vote_count.desc()).label("place")
 
-    # Получаем номинантов с количеством голосов, отсортированных по убыванию
-    result = await session.execute(
+    return (
         select(
-            Nominee,
-            func.coalesce(vote_count_subquery, 0).label("vote_count"),
+            Nomination.id.label("result_nomination_id"),
+            Nomination.title.label("nomination_title"),
+            *NOMINEE_COLUMNS,
+            vote_count,
+            place,
         )
-        .where(Nominee.nomination_id == nomination_id)
-        .order_by(func.coalesce(vote_count_subquery, 0).desc(), Nominee.created_at)
-    )
-
-    nominees_with_votes = []
-    for row in result.all():
-        nominee = row[0]
-        vote_count = row[1]
-        nominee_dict = {
-            "id": nominee.id,
-            "nomination_id": nominee.nomination_id,
-            "name": nominee.name,
-            "image_path": nominee.image_path,
-            "created_at": nominee.created_at,
-            "vote_count": vote_count,
-        }
-        nominees_with_votes.append(NomineeWithVotesResponse(**nominee_dict))
-
-    return NominationResultResponse(
-        nomination_id=nomination.id,
-        nomination_title=nomination.title,
-        nominees=nominees_with_votes,
+        .outerjoin(Nominee, Nominee.nomination_id == Nomination.id)
+        .outerjoin(totals, totals.c.nominee_id == Nominee.id)
+        .order_by(Nomination.created_at, Nomination.id, place, Nominee.created_at)
     )
 
 
-async def get_all_results(session: AsyncSession) -> ResultsSummaryResponse:
-    """Эта функция получает результаты по всем номинациям."""
+def _build_results(rows) -> list[dict[str, Any]]:
+    """Эта функция раскладывает плоские строки запроса по номинациям (словари в форме NominationResultResponse)."""
 
-    # Получаем все номинации из БД
-    result = await session.execute(select(Nomination).order_by(Nomination.created_at))
-    nominations = result.scalars().all()
     results = []
+    for (nomination_id, nomination_title), group in groupby(
+        rows, key=lambda row: (row.result_nomination_id, row.nomination_title)
+    ):
+        results.append(
+            {
+                "nomination_id": nomination_id,
+                "nomination_title": nomination_title,
+                # У номинации без номинантов LEFT JOIN даёт одну строку с пустым номинантом
+                "nominees": [nominee_row_to_dict(row, row.vote_count) for row in group if row.id is not None],
+            }
+        )
+    return results
+
+
+@single_flight
+async def get_results_data_by_nomination(session: AsyncSession, nomination_id: int) -> dict[str, Any] | None:
+    """Эта функция получает результаты по номинации готовым к JSON словарём (лёгкий путь для API)."""
 
-    for nomination in nominations:
-        result = await get_results_by_nomination(session, nomination.id)
-        if result:
-            results.append(result)
+    result = await session.execute(_results_query().where(Nomination.id == nomination_id))
+    results = _build_results(result.all())
+    return results[0] if results else None
 
-    return ResultsSummaryResponse(nominations=results)
 
+@single_flight
+async def get_all_results_data(session: AsyncSession) -> dict[str, Any]:
+    """Эта функция получает результаты по всем номинациям одним запросом готовым к JSON словарём."""
+
+    result = await session.execute(_results_query())
+    return {"nominations": _build_results(result.all())}
+
+
+async def get_results_by_nomination(
+    session: AsyncSession, nomination_id: int
+) -> NominationResultResponse | None:
+    """Эта функция получает результаты по конкретной номинации, отсортированные по убыванию голосов."""
+
+    data = await get_results_data_by_nomination(session, nomination_id)
+    return NominationResultResponse.model_validate(data) if data else None
+
+
+async def get_all_results(session: AsyncSession) -> ResultsSummaryResponse:
+    """Эта функция получает результаты по всем номинациям одним запросом."""
+
+    return ResultsSummaryResponse.model_validate(await get_all_results_data(session))
@@ -0,0 +1,210 @@
+import asyncio
+import json
+import logging
+import os
+import uuid
+from typing import Any
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.notifications import notification_listener, notify
+from app.db.session import async_session_factory
+from app.services.catalog_service import CATALOG_CHANNEL
+from app.services.vote_count_service import vote_totals
+
+logger = logging.getLogger(__name__)
+
+RESULTS_CHANNEL = "vrp_results"
+
+# Сообщение потока: (тип события, JSON-строка); None в очереди подписчика просит отдать снимок заново
+StreamMessage = tuple[str, str]
+
+
+class ResultsAggregator:
+    """
+    Этот агрегатор раздаёт счётчики голосов всем подписчикам потока результатов воркера.
+
+    Раз в тик он перечитывает итоги одним запросом, только если что-то изменилось:
+    голос зафиксирован в этом воркере или пришёл NOTIFY от другого. Каждый подписчик
+    получает сначала полный снимок счётчиков, а затем только изменившиеся значения.
+    Сообщение кодируется один раз и раздаётся всем подписчикам без копирования.
+    """
+
+    def __init__(self, tick_ms: int, queue_size: int) -> None:
+        self._tick = tick_ms / 1000
+        self._queue_size = queue_size
+        self._origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._counts: dict[int, int] = {}
+        self._version = 0
+        self._results_version = 0
+        self._results_changed = False
+        self._loaded = False
+        self._stale = True
+        self._announce = False
+        self._subscribers: set[asyncio.Queue[StreamMessage | None]] = set()
+        self._snapshot: tuple[int, StreamMessage] | None = None
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def version(self) -> int:
+        """Эта версия растёт при каждом изменении счётчиков или каталога."""
+
+        return self._version
+
+    @property
+    def results_version(self) -> int:
+        """
+        Эта версия итогов голосования растёт не чаще раза в тик.
+
+        По ней кэш ответов понимает, что сохранённые результаты устарели;
+        новые голоса видны в кэше с задержкой не больше одного тика.
+        """
+
+        return self._results_version
+
+    @property
+    def subscribers(self) -> int:
+        """Это число открытых потоков результатов в воркере."""
+
+        return len(self._subscribers)
+
+    def mark_local_change(self) -> None:
+        """Эта функция отмечает, что в этом воркере зафиксированы новые голоса."""
+
+        self._stale = True
+        self._announce = True
+        self._results_changed = True
+
+    def start(self) -> None:
+        """Эта функция подписывает агрегатор на уведомления и запускает тики."""
+
+        notification_listener.subscribe(RESULTS_CHANNEL, self._on_results_changed)
+        notification_listener.subscribe(CATALOG_CHANNEL, self._on_catalog_changed)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="results-aggregator")
+
+    async def stop(self) -> None:
+        """Эта функция останавливает тики агрегатора."""
+
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def subscribe(self) -> asyncio.Queue[StreamMessage | None]:
+        """Эта функция регистрирует подписчика; первым сообщением в его очереди лежит снимок."""
+
+        await self._refresh()
+        queue: asyncio.Queue[StreamMessage | None] = asyncio.Queue(maxsize=self._queue_size)
+        queue.put_nowait(self.snapshot_message())
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue[StreamMessage | None]) -> None:
+        """Эта функция убирает подписчика после закрытия соединения."""
+
+        self._subscribers.discard(queue)
+
+    def snapshot_message(self) -> StreamMessage:
+        """Эта функция отдаёт закодированный снимок всех счётчиков текущей версии."""
+
+        if self._snapshot is None or self._snapshot[0] != self._version:
+            message = self._encode("snapshot", {"counts": self._counts})
+            self._snapshot = (self._version, message)
+        return self._snapshot[1]
+
+    def _encode(self, event: str, data: dict[str, Any]) -> StreamMessage:
+        """Эта функция кодирует событие потока в JSON один раз для всех подписчиков."""
+
+        return event, json.dumps({"type": event, "version": self._version, **data}, separators=(",", ":"))
+
+    def _broadcast(self, message: StreamMessage) -> None:
+        """Эта функция кладёт сообщение всем подписчикам; отстающие получат снимок заново."""
+
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Подписчик не успевает читать: дельты ему больше не помогут
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    async def _refresh(self) -> None:
+        """Эта функция перечитывает итоги, если они устарели, и рассылает изменения."""
+
+        async with self._lock:
+            if self._loaded and not self._stale:
+                return
+            # Сбрасываем флаг до запроса: голоса во время запроса отметят итоги снова
+            self._stale = False
+            totals = vote_totals()
+            async with async_session_factory() as session:
+                result = await session.execute(select(totals.c.nominee_id, totals.c.vote_count))
+            counts = {nominee_id: vote_count for nominee_id, vote_count in result.all()}
+
+            changed = {nominee_id: count for nominee_id, count in counts.items() if self._counts.get(nominee_id) != count}
+            # Счётчики удалённых номинантов обнуляются
+            changed.update({nominee_id: 0 for nominee_id in self._counts if nominee_id not in counts})
+            self._counts = counts
+            if not self._loaded:
+                self._loaded = True
+                self._version += 1
+            elif changed:
+                self._version += 1
+                self._broadcast(self._encode("delta", {"counts": changed}))
+
+    async def _announce_change(self) -> None:
+        """Эта функция один раз за тик сообщает остальным воркерам о новых голосах."""
+
+        self._announce = False
+        try:
+            async with async_session_factory() as session:
+                await notify(session, RESULTS_CHANNEL, self._origin)
+                await session.commit()
+        except Exception:
+            self._announce = True
+            raise
+
+    async def _run(self) -> None:
+        """Эта функция выполняет тики: уведомление других воркеров и рассылку изменений."""
+
+        while True:
+            await asyncio.sleep(self._tick)
+            if self._results_changed:
+                self._results_changed = False
+                self._results_version += 1
+            try:
+                if self._announce:
+                    await self._announce_change()
+                # Без подписчиков итоги перечитает первый из них
+                if self._stale and self._subscribers:
+                    await self._refresh()
+            except Exception as exc:
+                logger.warning("Results aggregator tick failed: %s", exc)
+
+    async def _on_results_changed(self, payload: str) -> None:
+        """Этот обработчик отмечает итоги устаревшими по уведомлению другого воркера."""
+
+        if payload != self._origin:
+            self._stale = True
+            self._results_changed = True
+
+    async def _on_catalog_changed(self, payload: str) -> None:
+        """Этот обработчик просит клиентов перечитать структуру результатов."""
+
+        self._stale = True
+        self._version += 1
+        self._broadcast(self._encode("reload", {}))
+
+
+results_aggregator = ResultsAggregator(
+    tick_ms=settings.results_stream_tick_ms,
+    queue_size=settings.results_stream_queue_size,
+)
@@ -1,36 +1,139 @@
-from sqlalchemy import select
+import time
+from collections.abc import Callable
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import ColumnElement, func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.db.models import Setting
+from app.db.notifications import notification_listener, notify
+
+TRUE_VALUES = ("true", "1", "yes", "on")
+SETTINGS_CHANNEL = "vrp_settings"
+
+T = TypeVar("T")
+
+
+class SettingDefinition(Generic[T]):
+    """Это описание настройки: ключ в таблице, разбор строки в тип и значение по умолчанию."""
+
+    __slots__ = ("key", "parse", "dump", "default")
+
+    def __init__(
+        self,
+        key: str,
+        parse: Callable[[str], T],
+        dump: Callable[[T], str],
+        default: Callable[[], T],
+    ) -> None:
+        self.key = key
+        self.parse = parse
+        self.dump = dump
+        self.default = default
+
+
+def _parse_bool(value: str) -> bool:
+    """Эта функция разбирает строковый флаг настройки."""
+
+    return value.lower() in TRUE_VALUES
+
+
+def _dump_bool(value: bool) -> str:
+    """Эта функция записывает флаг настройки строкой."""
+
+    return "true" if value else "false"
+
+
+VOTING_OPEN: SettingDefinition[bool] = SettingDefinition(
+    "voting_open", _parse_bool, _dump_bool, lambda: settings.voting_open_default
+)
+
+REGISTRY: dict[str, SettingDefinition[Any]] = {definition.key: definition for definition in (VOTING_OPEN,)}
+
+# Кэш значений: ключ -> (типизированное значение, момент устаревания по time.monotonic)
+_cache: dict[str, tuple[Any, float]] = {}
 
 
 async def get_setting_value(session: AsyncSession, key: str, default: str = "") -> str:
     """Эта функция получает значение настройки по ключу."""
 
-    result = await session.execute(select(Setting).where(Setting.key == key))
-    setting = result.scalar_one_or_none()
-    if setting:
-        return setting.value
+    result = await session.execute(select(Setting.value).where(Setting.key == key))
+    value = result.scalar_one_or_none()
+    if value is not None:
+        return value
     return default
 
 
 async def set_setting_value(session: AsyncSession, key: str, value: str) -> None:
-    """Эта функция устанавливает значение настройки."""
+    """
+    Эта функция устанавливает значение настройки одним UPSERT.
 
-    result = await session.execute(select(Setting).where(Setting.key == key))
-    setting = result.scalar_one_or_none()
-    if setting:
-        setting.value = value
-    else:
-        setting = Setting(key=key, value=value)
-        session.add(setting)
+    В той же транзакции уходит NOTIFY, по которому остальные воркеры сбрасывают кэш.
+    """
+
+    stmt = insert(Setting).values(key=key, value=value)
+    await session.execute(stmt.on_conflict_do_update(index_elements=[Setting.key], set_={"value": value}))
+    await notify(session, SETTINGS_CHANNEL, key)
     await session.commit()
+    invalidate_settings(key)
+
+
+async def get_setting(session: AsyncSession, definition: SettingDefinition[T]) -> T:
+    """
+    Эта функция отдаёт типизированное значение настройки из кэша или из БД.
+
+    Кэш сбрасывается по NOTIFY от любого писателя, а TTL settings_cache_ttl_seconds
+    ограничивает время расхождения, если уведомление потерялось.
+    """
+
+    cached = _cache.get(definition.key)
+    now = time.monotonic()
+    if cached is not None and cached[1] > now:
+        return cached[0]
+
+    raw = await get_setting_value(session, definition.key, "")
+    value = definition.parse(raw) if raw else definition.default()
+    _cache[definition.key] = (value, now + settings.settings_cache_ttl_seconds)
+    return value
+
+
+async def set_setting(session: AsyncSession, definition: SettingDefinition[T], value: T) -> None:
+    """Эта функция записывает типизированное значение настройки."""
+
+    await set_setting_value(session, definition.key, definition.dump(value))
+
+
+def invalidate_settings(key: str = "") -> None:
+    """Эта функция сбрасывает кэш одной настройки или всех сразу (при пустом ключе)."""
+
+    if key:
+        _cache.pop(key, None)
+    else:
+        _cache.clear()
+
+
+async def _on_settings_changed(payload: str) -> None:
+    """Этот обработчик сбрасывает кэш по уведомлению из другого воркера."""
+
+    invalidate_settings(payload)
+
+
+def start_settings() -> None:
+    """Эта функция подписывает кэш настроек на уведомления об изменениях."""
+
+    notification_listener.subscribe(SETTINGS_CHANNEL, _on_settings_changed)
 
 
 async def is_voting_open(session: AsyncSession) -> bool:
-    """Эта функция проверяет, открыто ли голосование."""
+    """Эта функция проверяет, открыто ли голосование (обычно без обращения к БД)."""
+
+    return await get_setting(session, VOTING_OPEN)
+
 
-    value = await get_setting_value(session, "voting_open", str(settings.voting_open_default))
-    return value.lower() in ("true", "1", "yes", "on")
+def voting_open_condition() -> ColumnElement[bool]:
+    """Это SQL-условие проверяет флаг голосования прямо внутри запроса."""
 
+    value = select(Setting.value).where(Setting.key == VOTING_OPEN.key).scalar_subquery()
+    return func.lower(func.coalesce(value, str(settings.voting_open_default))).in_(TRUE_VALUES)
@@ -0,0 +1,224 @@
+import os
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from sqlalchemy import CTE, delete, func, literal_column, select, text, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import UserVoteIndex, Vote
+from app.db.notifications import notification_listener, notify
+from app.services.catalog_service import CATALOG_CHANNEL
+
+USER_VOTES_CHANNEL = "vrp_user_votes"
+
+# Payload NOTIFY ограничен 8000 байт; длинный список пользователей заменяем сбросом кэша целиком
+_MAX_PAYLOAD_LENGTH = 7000
+
+_origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+class VotedNominationsCache:
+    """
+    Этот LRU-кэш хранит множество номинаций, в которых голосовал пользователь.
+
+    Записи появляются только после чтения полной строки user_vote_index, поэтому
+    присутствие номинации в кэше всегда означает, что голос действительно есть.
+    Голоса, принятые другими воркерами, сбрасывают запись пользователя по NOTIFY.
+    Чтение из БД, начатое до такого сброса, в кэш не попадает: оно могло не увидеть
+    новый голос (см. generation).
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[int, frozenset[int]] = OrderedDict()
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """Этот счётчик растёт при каждом сбросе записей кэша."""
+
+        return self._generation
+
+    def get(self, telegram_user_id: int) -> frozenset[int] | None:
+        """Эта функция отдаёт множество номинаций пользователя, если оно есть в кэше."""
+
+        entry = self._entries.get(telegram_user_id)
+        if entry is not None:
+            self._entries.move_to_end(telegram_user_id)
+        return entry
+
+    def put(self, telegram_user_id: int, nomination_ids: Iterable[int], generation: int) -> frozenset[int]:
+        """
+        Эта функция кладёт прочитанное из БД множество номинаций пользователя в кэш.
+
+        generation — значение счётчика до чтения из БД: если с тех пор кэш сбрасывали,
+        прочитанное могло устареть и не запоминается. С уже лежащей записью множество
+        объединяется, поэтому голоса, добавленные во время чтения, не теряются.
+        """
+
+        entry = frozenset(nomination_ids)
+        if generation != self._generation:
+            return entry
+        current = self._entries.get(telegram_user_id)
+        if current is not None:
+            entry |= current
+        self._entries[telegram_user_id] = entry
+        self._entries.move_to_end(telegram_user_id)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+        return entry
+
+    def add(self, telegram_user_id: int, nomination_id: int) -> None:
+        """Эта функция дописывает номинацию пользователю, если он уже есть в кэше."""
+
+        entry = self._entries.get(telegram_user_id)
+        if entry is not None:
+            self._entries[telegram_user_id] = entry | {nomination_id}
+
+    def discard(self, telegram_user_ids: Iterable[int]) -> None:
+        """Эта функция сбрасывает записи пользователей, проголосовавших в другом воркере."""
+
+        self._generation += 1
+        for telegram_user_id in telegram_user_ids:
+            self._entries.pop(telegram_user_id, None)
+
+    def clear(self) -> None:
+        """Эта функция очищает кэш целиком."""
+
+        self._generation += 1
+        self._entries.clear()
+
+
+voted_nominations_cache = VotedNominationsCache(settings.user_votes_cache_size)
+
+
+def update_user_vote_index(inserted: CTE) -> CTE:
+    """
+    Эта функция строит CTE, который дописывает номинации новых голосов в индекс пользователя.
+
+    Ожидает CTE вставки голосов с колонками telegram_user_id и nomination_id.
+    Массив хранится отсортированным и без повторов.
+    """
+
+    stmt = insert(UserVoteIndex).from_select(
+        ["telegram_user_id", "nomination_ids"],
+        select(
+            inserted.c.telegram_user_id,
+            func.array_agg(aggregate_order_by(inserted.c.nomination_id, inserted.c.nomination_id)),
+        )
+        .group_by(inserted.c.telegram_user_id)
+        # Строки индекса блокируются в одном порядке во всех пачках, без взаимоблокировок
+        .order_by(inserted.c.telegram_user_id),
+    )
+    merged = literal_column(
+        "ARRAY(SELECT DISTINCT n FROM unnest(user_vote_index.nomination_ids "
+        "|| excluded.nomination_ids) AS n ORDER BY n)"
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[UserVoteIndex.telegram_user_id], set_={"nomination_ids": merged}
+    ).cte("voted_index")
+
+
+async def get_voted_nominations(session: AsyncSession, telegram_user_id: int) -> frozenset[int]:
+    """Эта функция отдаёт номинации, в которых голосовал пользователь (из кэша или одной строкой из БД)."""
+
+    cached = voted_nominations_cache.get(telegram_user_id)
+    if cached is not None:
+        return cached
+
+    generation = voted_nominations_cache.generation
+    result = await session.execute(
+        select(UserVoteIndex.nomination_ids).where(UserVoteIndex.telegram_user_id == telegram_user_id)
+    )
+    return voted_nominations_cache.put(telegram_user_id, result.scalar_one_or_none() or (), generation)
+
+
+def remember_votes(accepted: Iterable[tuple[int, int]]) -> None:
+    """Эта функция отражает зафиксированные голоса (пользователь, номинация) в кэше."""
+
+    for telegram_user_id, nomination_id in accepted:
+        voted_nominations_cache.add(telegram_user_id, nomination_id)
+
+
+async def announce_votes(session: AsyncSession, telegram_user_ids: Iterable[int]) -> None:
+    """
+    Эта функция в текущей транзакции сообщает другим воркерам, кто проголосовал.
+
+    Уведомление уходит только после коммита, поэтому чужой кэш сбрасывается,
+    когда голоса уже видны в БД.
+    """
+
+    payload = f"{_origin} " + ",".join(map(str, sorted(set(telegram_user_ids))))
+    if len(payload) > _MAX_PAYLOAD_LENGTH:
+        payload = f"{_origin} *"
+    await notify(session, USER_VOTES_CHANNEL, payload)
+
+
+async def forget_votes_for_nominee(session: AsyncSession, nominee_id: int, nomination_id: int) -> None:
+    """Эта функция убирает номинацию из индекса у тех, кто голосовал за удаляемого номинанта."""
+
+    voters = select(Vote.telegram_user_id).where(Vote.nominee_id == nominee_id)
+    await session.execute(
+        update(UserVoteIndex)
+        .where(UserVoteIndex.telegram_user_id.in_(voters))
+        .values(nomination_ids=func.array_remove(UserVoteIndex.nomination_ids, nomination_id))
+    )
+
+
+async def forget_votes_for_nomination(session: AsyncSession, nomination_id: int) -> None:
+    """Эта функция убирает удаляемую номинацию из индекса всех пользователей."""
+
+    await session.execute(
+        update(UserVoteIndex)
+        .where(UserVoteIndex.nomination_ids.any(nomination_id))
+        .values(nomination_ids=func.array_remove(UserVoteIndex.nomination_ids, nomination_id))
+    )
+
+
+async def rebuild_user_vote_index(session: AsyncSession) -> int:
+    """Эта функция пересобирает индекс голосов пользователей из таблицы vote."""
+
+    await session.execute(text("LOCK TABLE vote IN SHARE MODE"))
+    await session.execute(delete(UserVoteIndex))
+    await session.execute(
+        insert(UserVoteIndex).from_select(
+            ["telegram_user_id", "nomination_ids"],
+            select(
+                Vote.telegram_user_id,
+                func.array_agg(aggregate_order_by(Vote.nomination_id.distinct(), Vote.nomination_id)),
+            ).group_by(Vote.telegram_user_id),
+        )
+    )
+    result = await session.execute(select(func.count()).select_from(UserVoteIndex))
+    # Остальные воркеры сбрасывают свои кэши целиком
+    await notify(session, USER_VOTES_CHANNEL, f"{_origin} *")
+    await session.commit()
+    voted_nominations_cache.clear()
+    return result.scalar() or 0
+
+
+async def _on_catalog_changed(payload: str) -> None:
+    """Этот обработчик сбрасывает кэш: удаление номинанта могло освободить чьи-то голоса."""
+
+    voted_nominations_cache.clear()
+
+
+async def _on_votes_announced(payload: str) -> None:
+    """Этот обработчик сбрасывает записи пользователей, проголосовавших в другом воркере."""
+
+    origin, _, user_ids = payload.partition(" ")
+    if not payload or user_ids == "*":
+        # Пустой payload — переподключение слушателя: уведомления могли потеряться
+        voted_nominations_cache.clear()
+    elif origin != _origin:
+        voted_nominations_cache.discard(int(user_id) for user_id in user_ids.split(",") if user_id)
+
+
+def start_user_votes() -> None:
+    """Эта функция подписывает кэш голосов пользователей на изменения каталога и чужие голоса."""
+
+    notification_listener.subscribe(CATALOG_CHANNEL, _on_catalog_changed)
+    notification_listener.subscribe(USER_VOTES_CHANNEL, _on_votes_announced)
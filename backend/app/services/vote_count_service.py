@@ -0,0 +1,90 @@
+from sqlalchemy import CTE, BigInteger, ColumnElement, ScalarSelect, Subquery, cast, delete, func, literal, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import NomineeVoteCount, Vote
+
+
+def vote_count_for(nominee_id) -> ScalarSelect[int]:
+    """
+    Эта функция строит подзапрос с суммой шардов счётчика для номинанта.
+
+    Принимает как конкретный ID, так и колонку (например, Nominee.id) для
+    коррелированного подзапроса. Стоимость — не больше vote_counter_shards строк
+    на номинанта вместо сканирования всех его голосов.
+    """
+
+    return (
+        select(cast(func.coalesce(func.sum(NomineeVoteCount.count), 0), BigInteger))
+        .where(NomineeVoteCount.nominee_id == nominee_id)
+        .scalar_subquery()
+    )
+
+
+def vote_totals() -> Subquery:
+    """Эта функция строит подзапрос с итогом голосов по каждому номинанту (GROUP BY по шардам)."""
+
+    return (
+        select(
+            NomineeVoteCount.nominee_id,
+            cast(func.sum(NomineeVoteCount.count), BigInteger).label("vote_count"),
+        )
+        .group_by(NomineeVoteCount.nominee_id)
+        .subquery("vote_totals")
+    )
+
+
+def _shard_of(telegram_user_id: ColumnElement[int]) -> ColumnElement[int]:
+    """Эта функция вычисляет номер шарда счётчика для голоса пользователя."""
+
+    # Число шардов подставляется литералом, чтобы выражение в SELECT и GROUP BY совпадало
+    return (telegram_user_id % literal(settings.vote_counter_shards, literal_execute=True)).label("shard")
+
+
+def increment_counters(inserted: CTE) -> CTE:
+    """
+    Эта функция строит CTE, который прибавляет вставленные голоса к счётчикам.
+
+    Ожидает CTE вставки голосов с колонками telegram_user_id и nominee_id.
+    Удаления голосов сейчас происходят только каскадом вместе с номинантом,
+    и строки счётчика удаляются тем же каскадом.
+    """
+
+    shard = _shard_of(inserted.c.telegram_user_id)
+    stmt = insert(NomineeVoteCount).from_select(
+        ["nominee_id", "shard", "count"],
+        select(inserted.c.nominee_id, shard, func.count())
+        .group_by(inserted.c.nominee_id, shard)
+        # Строки счётчиков блокируются в одном порядке во всех пачках, без взаимоблокировок
+        .order_by(inserted.c.nominee_id, shard),
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[NomineeVoteCount.nominee_id, NomineeVoteCount.shard],
+        set_={"count": NomineeVoteCount.count + stmt.excluded.count},
+    ).cte("counters")
+
+
+async def reconcile_vote_counts(session: AsyncSession) -> int:
+    """
+    Эта функция пересобирает счётчики голосов из таблицы vote.
+
+    На время пересчёта таблица vote блокируется от записи, чтобы ни один голос
+    не потерялся и не посчитался дважды. Возвращает число номинантов с голосами.
+    """
+
+    await session.execute(text("LOCK TABLE vote IN SHARE MODE"))
+    await session.execute(delete(NomineeVoteCount))
+
+    shard = _shard_of(Vote.telegram_user_id)
+    await session.execute(
+        insert(NomineeVoteCount).from_select(
+            ["nominee_id", "shard", "count"],
+            select(Vote.nominee_id, shard, func.count(Vote.id)).group_by(Vote.nominee_id, shard),
+        )
+    )
+    result = await session.execute(
+        select(func.count(func.distinct(NomineeVoteCount.nominee_id)))
+    )
+    await session.commit()
+    return result.scalar() or 0
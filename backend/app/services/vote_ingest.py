@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.schemas.vote import VoteResponse
+
+logger = logging.getLogger(__name__)
+
+# Голос в очереди: (telegram_user_id, nominee_id, nomination_id)
+VoteItem = tuple[int, int, int]
+
+
+class VoteIngestBuffer:
+    """
+    Этот буфер копит голоса в ограниченной очереди и записывает их пачками.
+
+    Фоновая задача забирает голоса из очереди и сбрасывает пачку, как только набралось
+    max_batch_size голосов или прошло max_delay_ms с первого голоса пачки. Каждый
+    запрос ждёт future, которая завершается только после фиксации его пачки.
+    Переполненная очередь притормаживает новые запросы (backpressure).
+    Пачка, упавшая на временной ошибке (is_retryable), повторяется один раз, а затем
+    записывается по одному голосу, чтобы ошибка досталась только своему запросу.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[VoteItem]], Awaitable[list[VoteResponse]]],
+        max_batch_size: int,
+        max_delay_ms: int,
+        max_queue_size: int,
+        is_retryable: Callable[[Exception], bool] = lambda exc: False,
+    ) -> None:
+        self._flush = flush
+        self._is_retryable = is_retryable
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay_ms / 1000
+        self._max_queue_size = max_queue_size
+        self._queue: asyncio.Queue[tuple[VoteItem, asyncio.Future] | None] | None = None
+        self._task: asyncio.Task | None = None
+        self._closing = False
+
+        self._batches = 0
+        self._votes = 0
+        self._last_batch_size = 0
+        self._largest_batch_size = 0
+        self._flush_seconds_total = 0.0
+        self._last_flush_seconds = 0.0
+        self._slowest_flush_seconds = 0.0
+        self._failed_batches = 0
+        self._retried_flushes = 0
+        self._split_batches = 0
+
+    @property
+    def running(self) -> bool:
+        """Этот флаг говорит, принимает ли буфер голоса."""
+
+        return self._task is not None and not self._closing
+
+    def start(self) -> None:
+        """Эта функция запускает фоновую задачу записи пачек."""
+
+        if self._task is not None:
+            return
+        self._closing = False
+        self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+        self._task = asyncio.create_task(self._run(), name="vote-ingest-flusher")
+        logger.info(
+            "Vote ingest buffer started: batch=%s, delay=%sms, queue=%s",
+            self._max_batch_size,
+            int(self._max_delay * 1000),
+            self._max_queue_size,
+        )
+
+    async def stop(self) -> None:
+        """Эта функция перестаёт принимать голоса, дописывает очередь и останавливает задачу."""
+
+        if self._task is None or self._queue is None:
+            return
+        self._closing = True
+        # Маркер конца: всё, что лежит в очереди до него, будет записано
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        logger.info("Vote ingest buffer drained and stopped")
+
+    async def submit(self, item: VoteItem) -> VoteResponse:
+        """Эта функция ставит голос в очередь и ждёт фиксации его пачки."""
+
+        if not self.running or self._queue is None:
+            raise RuntimeError("Буфер голосов не запущен")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    def metrics(self) -> dict[str, Any]:
+        """Эта функция возвращает метрики буфера: размер пачек, задержку записи и глубину очереди."""
+
+        return {
+            "running": self.running,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_capacity": self._max_queue_size,
+            "batches": self._batches,
+            "votes": self._votes,
+            "failed_batches": self._failed_batches,
+            "retried_flushes": self._retried_flushes,
+            "split_batches": self._split_batches,
+            "last_batch_size": self._last_batch_size,
+            "largest_batch_size": self._largest_batch_size,
+            "avg_batch_size": round(self._votes / self._batches, 2) if self._batches else 0,
+            "last_flush_ms": round(self._last_flush_seconds * 1000, 2),
+            "slowest_flush_ms": round(self._slowest_flush_seconds * 1000, 2),
+            "avg_flush_ms": (
+                round(self._flush_seconds_total / self._batches * 1000, 2) if self._batches else 0
+            ),
+        }
+
+    async def _run(self) -> None:
+        """Эта функция собирает пачки из очереди и записывает их до маркера конца."""
+
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        finished = False
+
+        while not finished:
+            entry = await self._queue.get()
+            if entry is None:
+                break
+
+            batch = [entry]
+            deadline = loop.time() + self._max_delay
+            while len(batch) < self._max_batch_size:
+                remaining = deadline - loop.time()
+                try:
+                    if remaining > 0:
+                        entry = await asyncio.wait_for(self._queue.get(), remaining)
+                    else:
+                        entry = self._queue.get_nowait()
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                if entry is None:
+                    finished = True
+                    break
+                batch.append(entry)
+
+            await self._write(batch)
+
+    async def _flush_with_retry(self, items: list[VoteItem]) -> list[VoteResponse]:
+        """Эта функция записывает голоса и один раз повторяет запись после временной ошибки."""
+
+        try:
+            return await self._flush(items)
+        except Exception as exc:
+            if not self._is_retryable(exc):
+                raise
+            self._retried_flushes += 1
+            logger.warning("Vote flush of %s hit a transient error, retrying: %s", len(items), exc)
+            return await self._flush(items)
+
+    async def _write(self, batch: list[tuple[VoteItem, asyncio.Future]]) -> None:
+        """Эта функция записывает одну пачку и будит ожидающие запросы."""
+
+        started = time.perf_counter()
+        try:
+            responses = await self._flush_with_retry([item for item, _ in batch])
+        except Exception as exc:
+            if len(batch) > 1 and self._is_retryable(exc):
+                # Пачка снова упала на взаимоблокировке: пишем голоса по одному
+                self._split_batches += 1
+                logger.warning("Vote batch of %s keeps failing, writing votes one by one: %s", len(batch), exc)
+                await self._write_each(batch)
+            else:
+                self._failed_batches += 1
+                logger.error("Vote batch of %s failed: %s", len(batch), exc, exc_info=True)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+
+        self._record(len(batch), time.perf_counter() - started)
+        for (_, future), response in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
+
+    async def _write_each(self, batch: list[tuple[VoteItem, asyncio.Future]]) -> None:
+        """Эта функция записывает голоса пачки по одному; ошибка достаётся только своему запросу."""
+
+        for item, future in batch:
+            started = time.perf_counter()
+            try:
+                (response,) = await self._flush_with_retry([item])
+            except Exception as exc:
+                self._failed_batches += 1
+                logger.error("Vote %s failed: %s", item, exc, exc_info=True)
+                if not future.done():
+                    future.set_exception(exc)
+                continue
+            self._record(1, time.perf_counter() - started)
+            if not future.done():
+                future.set_result(response)
+
+    def _record(self, size: int, elapsed: float) -> None:
+        """Эта функция учитывает записанную пачку в метриках."""
+
+        self._batches += 1
+        self._votes += size
+        self._last_batch_size = size
+        self._largest_batch_size = max(self._largest_batch_size, size)
+        self._last_flush_seconds = elapsed
+        self._slowest_flush_seconds = max(self._slowest_flush_seconds, elapsed)
+        self._flush_seconds_total += elapsed
@@ -1,104 +1,277 @@
-from sqlalchemy import func, select
-from sqlalchemy.exc import IntegrityError
+import asyncio
+from collections.abc import Sequence
+
+from sqlalchemy import BigInteger, Integer, and_, column, func, select, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.db.models import Nominee, Vote
+from app.db.session import async_session_factory
 from app.schemas.vote import VoteResponse
-from app.services.nominee_service import get_nominee_by_id
-from app.services.settings_service import is_voting_open
+from app.services.catalog_service import get_catalog
+from app.services.results_stream import results_aggregator
+from app.services.settings_service import is_voting_open, voting_open_condition
+from app.services.vote_count_service import increment_counters, vote_count_for
+from app.services.user_votes_service import (
+    announce_votes,
+    remember_votes,
+    update_user_vote_index,
+    voted_nominations_cache,
+)
+from app.services.vote_ingest import VoteIngestBuffer, VoteItem
 
 
-async def check_user_voted_in_nomination(
-    session: AsyncSession, telegram_user_id: int, nomination_id: int
-) -> bool:
-    """Проверяет, голосовал ли пользователь в этой номинации."""
-    
-    result = await session.execute(
-        select(Vote)
-        .join(Nominee)
-        .where(Vote.telegram_user_id == telegram_user_id)
-        .where(Nominee.nomination_id == nomination_id)
-    )
-    return result.scalar_one_or_none() is not None
+async def insert_votes(session: AsyncSession, items: Sequence[VoteItem]) -> list[VoteResponse]:
+    """
+    Эта функция вставляет пачку голосов одним SQL-выражением и не фиксирует транзакцию.
 
+    Проверка флага голосования, существования номинанта, вставка голосов, обновление
+    счётчиков и индекса голосов пользователя, подсчёт голосов выполняются одним запросом. Повторный голос в номинации
+    отсекает ограничение uq_vote_user_nomination через ON CONFLICT DO NOTHING.
+    Ответы возвращаются в том же порядке, что и items. Если голоса приняты, в той же
+    транзакции уходит NOTIFY, чтобы другие воркеры сбросили кэш голосов этих пользователей.
+    """
 
-async def create_vote(
-    session: AsyncSession, telegram_user_id: int, nominee_id: int, nomination_id: int
-) -> VoteResponse:
-    """Эта функция создаёт голос за номинанта."""
+    incoming = select(
+        values(
+            column("position", Integer),
+            column("telegram_user_id", BigInteger),
+            column("nominee_id", Integer),
+            column("nomination_id", Integer),
+            name="incoming",
+        ).data([(position, *item) for position, item in enumerate(items)])
+    ).cte("incoming")
 
-    # Проверяем, открыто ли голосование
-    voting_open = await is_voting_open(session)
-    if not voting_open:
-        return VoteResponse(
-            success=False,
-            message="Голосование закрыто",
-            nominee_name="",
-            vote_count=0,
+    voting_open = voting_open_condition()
+    nominee_matches = and_(
+        Nominee.id == incoming.c.nominee_id, Nominee.nomination_id == incoming.c.nomination_id
+    )
+
+    inserted = (
+        insert(Vote)
+        .from_select(
+            ["telegram_user_id", "nominee_id", "nomination_id"],
+            select(incoming.c.telegram_user_id, Nominee.id, Nominee.nomination_id)
+            .join_from(incoming, Nominee, nominee_matches)
+            .where(voting_open)
+            # Единый порядок блокировок ключей между параллельными пачками
+            .order_by(incoming.c.telegram_user_id, incoming.c.nomination_id),
         )
+        .on_conflict_do_nothing()
+        .returning(Vote.telegram_user_id, Vote.nominee_id, Vote.nomination_id)
+        .cte("inserted")
+    )
+    counters = increment_counters(inserted)
+    voted_index = update_user_vote_index(inserted)
+    added = (
+        select(inserted.c.nominee_id, func.count().label("added"))
+        .group_by(inserted.c.nominee_id)
+        .subquery("added")
+    )
+    # Запрос не видит изменений своих же CTE, поэтому добавляем вставку к счётчику вручную
+    vote_count = vote_count_for(incoming.c.nominee_id) + func.coalesce(added.c.added, 0)
 
-    # Проверяем существование номинанта
-    nominee = await get_nominee_by_id(session, nominee_id)
-    if not nominee:
-        return VoteResponse(
-            success=False,
-            message="Номинант не найден",
-            nominee_name="",
-            vote_count=0,
+    result = await session.execute(
+        select(
+            voting_open.label("voting_open"),
+            Nominee.name.label("nominee_name"),
+            inserted.c.nominee_id.is_not(None).label("inserted"),
+            vote_count.label("vote_count"),
         )
+        .select_from(incoming)
+        .outerjoin(Nominee, nominee_matches)
+        .outerjoin(
+            inserted,
+            and_(
+                inserted.c.telegram_user_id == incoming.c.telegram_user_id,
+                inserted.c.nominee_id == incoming.c.nominee_id,
+            ),
+        )
+        .outerjoin(added, added.c.nominee_id == incoming.c.nominee_id)
+        .order_by(incoming.c.position)
+        .add_cte(counters, voted_index)
+    )
 
-    # Проверяем, не голосовал ли пользователь уже в этой номинации
-    already_voted = await check_user_voted_in_nomination(
-        session, telegram_user_id, nomination_id
+    responses = []
+    accepted: set[tuple[int, int]] = set()
+    for item, row in zip(items, result.all()):
+        # Один и тот же голос дважды в пачке засчитывается только первой записи
+        is_new = row.inserted and (item[0], item[2]) not in accepted
+        if is_new:
+            accepted.add((item[0], item[2]))
+        responses.append(_build_vote_response(row, is_new))
+    if accepted:
+        await announce_votes(session, (telegram_user_id for telegram_user_id, _ in accepted))
+    return responses
+
+
+def _voting_closed_response() -> VoteResponse:
+    """Эта функция формирует ответ для закрытого голосования."""
+
+    return VoteResponse(
+        success=False,
+        message="Голосование закрыто",
+        nominee_name="",
+        vote_count=0,
     )
-    
-    if already_voted:
-        # Подсчитываем текущее количество голосов
-        result = await session.execute(
-            select(func.count(Vote.id)).where(Vote.nominee_id == nominee_id)
-        )
-        vote_count = result.scalar() or 0
-        
+
+
+def _nominee_not_found_response() -> VoteResponse:
+    """Эта функция формирует ответ для неизвестного номинанта."""
+
+    return VoteResponse(
+        success=False,
+        message="Номинант не найден",
+        nominee_name="",
+        vote_count=0,
+    )
+
+
+def _build_vote_response(row, inserted: bool) -> VoteResponse:
+    """Эта функция превращает строку результата вставки в ответ API."""
+
+    if not row.voting_open:
+        return _voting_closed_response()
+
+    if row.nominee_name is None:
+        return _nominee_not_found_response()
+
+    if not inserted:
         return VoteResponse(
             success=False,
             message="Вы уже проголосовали в этой номинации",
-            nominee_name=nominee.name,
-            vote_count=vote_count,
+            nominee_name=row.nominee_name,
+            vote_count=row.vote_count,
             already_voted=True,
         )
 
-    try:
-        # Создаём голос
-        vote = Vote(telegram_user_id=telegram_user_id, nominee_id=nominee_id)
-        session.add(vote)
+    return VoteResponse(
+        success=True,
+        message="Голос успешно учтён",
+        nominee_name=row.nominee_name,
+        vote_count=row.vote_count,
+    )
+
+
+async def _flush_vote_batch(items: list[VoteItem]) -> list[VoteResponse]:
+    """Эта функция записывает накопленную пачку голосов одной транзакцией."""
+
+    async with async_session_factory() as session:
+        responses = await insert_votes(session, items)
         await session.commit()
-        await session.refresh(vote)
+    _remember_accepted(items, responses)
+    return responses
 
-        # Подсчитываем общее количество голосов
-        result = await session.execute(
-            select(func.count(Vote.id)).where(Vote.nominee_id == nominee_id)
-        )
-        vote_count = result.scalar() or 0
 
-        return VoteResponse(
-            success=True,
-            message="Голос успешно учтён",
-            nominee_name=nominee.name,
-            vote_count=vote_count,
-        )
-    except IntegrityError:
-        await session.rollback()
-        # На случай race condition - если два запроса пришли одновременно
-        result = await session.execute(
-            select(func.count(Vote.id)).where(Vote.nominee_id == nominee_id)
-        )
-        vote_count = result.scalar() or 0
-        
+def _remember_accepted(items: Sequence[VoteItem], responses: Sequence[VoteResponse]) -> None:
+    """Эта функция отражает принятые голоса в кэше «где пользователь уже голосовал» и в потоке результатов."""
+
+    if any(response.success for response in responses):
+        results_aggregator.mark_local_change()
+    remember_votes(
+        (telegram_user_id, nomination_id)
+        for (telegram_user_id, _, nomination_id), response in zip(items, responses)
+        if response.success
+    )
+
+
+# SQLSTATE взаимоблокировки и конфликта сериализации: такую транзакцию можно просто повторить
+_TRANSIENT_SQLSTATES = frozenset({"40P01", "40001"})
+
+
+def _is_transient_db_error(exc: Exception) -> bool:
+    """Эта функция проверяет, что запись упала на взаимоблокировке или конфликте сериализации."""
+
+    return isinstance(exc, DBAPIError) and getattr(exc.orig, "sqlstate", None) in _TRANSIENT_SQLSTATES
+
+
+# Буфер отложенной записи; включается настройкой VOTE_INGEST_BATCHED
+vote_ingest_buffer = VoteIngestBuffer(
+    flush=_flush_vote_batch,
+    max_batch_size=settings.vote_batch_max_size,
+    max_delay_ms=settings.vote_batch_max_delay_ms,
+    max_queue_size=settings.vote_batch_queue_size,
+    is_retryable=_is_transient_db_error,
+)
+
+
+async def create_vote(
+    session: AsyncSession, telegram_user_id: int, nominee_id: int, nomination_id: int
+) -> VoteResponse:
+    """
+    Эта функция создаёт голос за номинанта.
+
+    Флаг голосования берётся из кэша настроек, а номинант и его принадлежность
+    номинации проверяются по снимку каталога в памяти, поэтому закрытое голосование
+    и неверный голос отклоняются без обращения к БД. Повторный голос пользователя,
+    чьи номинации уже есть в кэше, отклоняется без попытки вставки. В обычном режиме голос
+    записывается одним запросом в сессии запроса. Если включён буфер отложенной записи,
+    голос уходит в очередь и функция ждёт фиксации его пачки.
+    """
+
+    if not await is_voting_open(session):
+        return _voting_closed_response()
+
+    catalog = await get_catalog()
+    nominee = catalog.find_nominee(nominee_id, nomination_id)
+    if nominee is None:
+        return _nominee_not_found_response()
+
+    voted = voted_nominations_cache.get(telegram_user_id)
+    if voted is not None and nomination_id in voted:
+        result = await session.execute(select(vote_count_for(nominee_id)))
         return VoteResponse(
             success=False,
             message="Вы уже проголосовали в этой номинации",
             nominee_name=nominee.name,
-            vote_count=vote_count,
+            vote_count=result.scalar() or 0,
             already_voted=True,
         )
 
+    [response] = await _write_votes(session, [(telegram_user_id, nominee_id, nomination_id)])
+    return response
+
+
+async def create_votes(
+    session: AsyncSession, telegram_user_id: int, votes: Sequence[tuple[int, int]]
+) -> list[VoteResponse]:
+    """
+    Эта функция принимает сразу несколько голосов пользователя (nominee_id, nomination_id).
+
+    Все голоса проверяются по кэшу настроек и каталогу за один проход и записываются
+    одним запросом. Каждый голос получает свой ответ: часть может быть принята,
+    а часть отклонена, порядок ответов совпадает с порядком голосов.
+    """
+
+    if not await is_voting_open(session):
+        return [_voting_closed_response() for _ in votes]
+
+    catalog = await get_catalog()
+    responses: list[VoteResponse | None] = [None] * len(votes)
+    positions: list[int] = []
+    items: list[VoteItem] = []
+    for position, (nominee_id, nomination_id) in enumerate(votes):
+        if catalog.find_nominee(nominee_id, nomination_id) is None:
+            responses[position] = _nominee_not_found_response()
+        else:
+            positions.append(position)
+            items.append((telegram_user_id, nominee_id, nomination_id))
+
+    if items:
+        for position, response in zip(positions, await _write_votes(session, items)):
+            responses[position] = response
+    return responses
+
+
+async def _write_votes(session: AsyncSession, items: list[VoteItem]) -> list[VoteResponse]:
+    """Эта функция записывает проверенные голоса напрямую или через буфер отложенной записи."""
+
+    if vote_ingest_buffer.running:
+        return list(await asyncio.gather(*(vote_ingest_buffer.submit(item) for item in items)))
+
+    responses = await insert_votes(session, items)
+    await session.commit()
+    _remember_accepted(items, responses)
+    return responses
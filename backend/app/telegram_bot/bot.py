@@ -1,9 +1,9 @@
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
-from aiogram.fsm.storage.memory import MemoryStorage
 
 from app.core.config import settings
+from app.telegram_bot.storage import fsm_storage
 
 
 def create_bot() -> Bot:
@@ -19,8 +19,7 @@ def create_bot() -> Bot:
 
 
 def create_dispatcher() -> Dispatcher:
-    """Эта функция создаёт диспетчер для обработки сообщений."""
+    """Эта функция создаёт диспетчер для обработки сообщений (FSM хранится в Postgres)."""
 
-    storage = MemoryStorage()
-    return Dispatcher(storage=storage)
+    return Dispatcher(storage=fsm_storage)
 
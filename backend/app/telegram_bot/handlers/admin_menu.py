@@ -2,7 +2,6 @@ from aiogram import Router
 from aiogram.filters import Command
 from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
 
-from app.db.session import async_session_factory
 from app.services.admin_service import is_admin
 
 router = Router()
@@ -36,14 +35,13 @@ async def cmd_admin(message: Message) -> None:
         await message.answer("❌ Не удалось определить пользователя.")
         return
 
-    async with async_session_factory() as session:
-        if await is_admin(session, user_id):
-            await message.answer(
-                "👋 <b>Панель администратора</b>\n\nВыберите действие:",
-                reply_markup=get_admin_keyboard(),
-            )
-        else:
-            await message.answer("❌ У вас нет прав администратора.")
+    if await is_admin(user_id):
+        await message.answer(
+            "👋 <b>Панель администратора</b>\n\nВыберите действие:",
+            reply_markup=get_admin_keyboard(),
+        )
+    else:
+        await message.answer("❌ У вас нет прав администратора.")
 
 
 @router.callback_query(lambda c: c.data == "admin_menu")
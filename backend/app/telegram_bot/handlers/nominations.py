@@ -5,13 +5,15 @@ from aiogram import Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
 
-from app.core.config import settings
 from app.db.models import Nomination
 from app.db.session import async_session_factory
 from app.schemas.nomination import NominationResponse
+from app.services.catalog_service import commit_catalog_change
+from app.services.media_service import save_uploaded_image
 from app.services.nomination_service import get_all_nominations
+from app.services.user_votes_service import forget_votes_for_nomination
 from app.telegram_bot.states import CreateNominationState, EditNominationState
-from app.utils.image_validator import validate_image_square
+from app.utils.image_executor import process_image
 
 router = Router()
 
@@ -109,7 +111,7 @@ async def process_nomination_image(message: Message, state: FSMContext) -> None:
     file_data = await message.bot.download_file(file.file_path)
 
     image_data = file_data.read() if hasattr(file_data, 'read') else file_data
-    is_valid, error_msg = validate_image_square(image_data)
+    is_valid, error_msg, derivatives = await process_image(image_data)
     if not is_valid:
         await message.answer(f"❌ {error_msg}\nПопробуйте снова:")
         return
@@ -122,24 +124,19 @@ async def process_nomination_image(message: Message, state: FSMContext) -> None:
         await state.clear()
         return
 
-    # Создаём директорию для изображений
-    media_dir = Path(settings.media_folder) / "nominations"
-    media_dir.mkdir(parents=True, exist_ok=True)
-
-    # Сохраняем файл
+    # Сохраняем изображение и его уменьшенные копии
     file_extension = Path(file.file_path).suffix or ".jpg"
-    file_name = f"{title.lower().replace(' ', '_')}{file_extension}"
-    file_path = media_dir / file_name
-    file_path.write_bytes(image_data)
+    image_path, image_formats = await save_uploaded_image(image_data, file_extension, derivatives)
 
     # Сохраняем в БД
     async with async_session_factory() as session:
         nomination = Nomination(
             title=title,
-            image_path=str(file_path.relative_to(Path(settings.media_folder))),
+            image_path=image_path,
+            image_formats=image_formats,
         )
         session.add(nomination)
-        await session.commit()
+        await commit_catalog_change(session)
 
     await state.clear()
     await message.answer(f"✅ Номинация <b>{title}</b> успешно создана!")
@@ -203,13 +200,9 @@ async def delete_nomination(callback: CallbackQuery) -> None:
         nomination = result.scalar_one_or_none()
 
         if nomination:
-            # Удаляем файл изображения
-            image_path = Path(settings.media_folder) / nomination.image_path
-            if image_path.exists():
-                image_path.unlink()
-
+            await forget_votes_for_nomination(session, nomination.id)
             await session.delete(nomination)
-            await session.commit()
+            await commit_catalog_change(session)
             await callback.message.edit_text("✅ Номинация удалена.")
         else:
             await callback.answer("❌ Номинация не найдена.", show_alert=True)
@@ -252,7 +245,7 @@ async def process_new_nomination_title(message: Message, state: FSMContext) -> N
 
         if nomination:
             nomination.title = new_title
-            await session.commit()
+            await commit_catalog_change(session)
             await message.answer(f"✅ Название номинации изменено на <b>{new_title}</b>")
         else:
             await message.answer("❌ Номинация не найдена.")
@@ -284,7 +277,7 @@ async def process_new_nomination_image(message: Message, state: FSMContext) -> N
     file_data = await message.bot.download_file(file.file_path)
 
     image_data = file_data.read() if hasattr(file_data, 'read') else file_data
-    is_valid, error_msg = validate_image_square(image_data)
+    is_valid, error_msg, derivatives = await process_image(image_data)
     if not is_valid:
         await message.answer(f"❌ {error_msg}\nПопробуйте снова:")
         return
@@ -303,22 +296,13 @@ async def process_new_nomination_image(message: Message, state: FSMContext) -> N
         nomination = result.scalar_one_or_none()
 
         if nomination:
-            # Удаляем старое изображение
-            old_image_path = Path(settings.media_folder) / nomination.image_path
-            if old_image_path.exists():
-                old_image_path.unlink()
-
-            # Сохраняем новое изображение
-            media_dir = Path(settings.media_folder) / "nominations"
-            media_dir.mkdir(parents=True, exist_ok=True)
-
+            # Старое изображение удалит сборщик мусора, когда на него не останется ссылок
             file_extension = Path(file.file_path).suffix or ".jpg"
-            file_name = f"{nomination.title.lower().replace(' ', '_')}{file_extension}"
-            file_path = media_dir / file_name
-            file_path.write_bytes(image_data)
+            image_path, image_formats = await save_uploaded_image(image_data, file_extension, derivatives)
 
-            nomination.image_path = str(file_path.relative_to(Path(settings.media_folder)))
-            await session.commit()
+            nomination.image_path = image_path
+            nomination.image_formats = image_formats
+            await commit_catalog_change(session)
             await message.answer("✅ Изображение номинации обновлено.")
         else:
             await message.answer("❌ Номинация не найдена.")
@@ -4,13 +4,15 @@ from aiogram import Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
 
-from app.core.config import settings
 from app.db.models import Nomination, Nominee
 from app.db.session import async_session_factory
 from app.schemas.nomination import NominationResponse
+from app.services.catalog_service import commit_catalog_change
+from app.services.media_service import save_uploaded_image
 from app.services.nomination_service import get_all_nominations
+from app.services.user_votes_service import forget_votes_for_nominee
 from app.telegram_bot.states import CreateNomineeState, EditNomineeState
-from app.utils.image_validator import validate_image_square
+from app.utils.image_executor import process_image
 
 router = Router()
 
@@ -151,7 +153,7 @@ async def process_nominee_image(message: Message, state: FSMContext) -> None:
     file_data = await message.bot.download_file(file.file_path)
 
     image_data = file_data.read() if hasattr(file_data, 'read') else file_data
-    is_valid, error_msg = validate_image_square(image_data)
+    is_valid, error_msg, derivatives = await process_image(image_data)
     if not is_valid:
         await message.answer(f"❌ {error_msg}\nПопробуйте снова:")
         return
@@ -165,24 +167,20 @@ async def process_nominee_image(message: Message, state: FSMContext) -> None:
         await state.clear()
         return
 
-    # Сохраняем изображение
-    media_dir = Path(settings.media_folder) / "nominees"
-    media_dir.mkdir(parents=True, exist_ok=True)
-
+    # Сохраняем изображение и его уменьшенные копии
     file_extension = Path(file.file_path).suffix or ".jpg"
-    file_name = f"{name.lower().replace(' ', '_')}_{nomination_id}{file_extension}"
-    file_path = media_dir / file_name
-    file_path.write_bytes(image_data)
+    image_path, image_formats = await save_uploaded_image(image_data, file_extension, derivatives)
 
     # Сохраняем в БД
     async with async_session_factory() as session:
         nominee = Nominee(
             nomination_id=nomination_id,
             name=name,
-            image_path=str(file_path.relative_to(Path(settings.media_folder))),
+            image_path=image_path,
+            image_formats=image_formats,
         )
         session.add(nominee)
-        await session.commit()
+        await commit_catalog_change(session)
 
     await state.clear()
     await message.answer(f"✅ Номинант <b>{name}</b> успешно добавлен!")
@@ -279,13 +277,9 @@ async def delete_nominee(callback: CallbackQuery) -> None:
         nominee = result.scalar_one_or_none()
 
         if nominee:
-            # Удаляем файл изображения
-            image_path = Path(settings.media_folder) / nominee.image_path
-            if image_path.exists():
-                image_path.unlink()
-
+            await forget_votes_for_nominee(session, nominee.id, nominee.nomination_id)
             await session.delete(nominee)
-            await session.commit()
+            await commit_catalog_change(session)
             await callback.message.edit_text("✅ Номинант удалён.")
         else:
             await callback.answer("❌ Номинант не найден.", show_alert=True)
@@ -328,7 +322,7 @@ async def process_new_nominee_name(message: Message, state: FSMContext) -> None:
 
         if nominee:
             nominee.name = new_name
-            await session.commit()
+            await commit_catalog_change(session)
             await message.answer(f"✅ Имя номинанта изменено на <b>{new_name}</b>")
         else:
             await message.answer("❌ Номинант не найден.")
@@ -360,7 +354,7 @@ async def process_new_nominee_image(message: Message, state: FSMContext) -> None
     file_data = await message.bot.download_file(file.file_path)
 
     image_data = file_data.read() if hasattr(file_data, 'read') else file_data
-    is_valid, error_msg = validate_image_square(image_data)
+    is_valid, error_msg, derivatives = await process_image(image_data)
     if not is_valid:
         await message.answer(f"❌ {error_msg}\nПопробуйте снова:")
         return
@@ -379,22 +373,13 @@ async def process_new_nominee_image(message: Message, state: FSMContext) -> None
         nominee = result.scalar_one_or_none()
 
         if nominee:
-            # Удаляем старое изображение
-            old_image_path = Path(settings.media_folder) / nominee.image_path
-            if old_image_path.exists():
-                old_image_path.unlink()
-
-            # Сохраняем новое изображение
-            media_dir = Path(settings.media_folder) / "nominees"
-            media_dir.mkdir(parents=True, exist_ok=True)
-
+            # Старое изображение удалит сборщик мусора, когда на него не останется ссылок
             file_extension = Path(file.file_path).suffix or ".jpg"
-            file_name = f"{nominee.name.lower().replace(' ', '_')}_{nominee.nomination_id}{file_extension}"
-            file_path = media_dir / file_name
-            file_path.write_bytes(image_data)
+            image_path, image_formats = await save_uploaded_image(image_data, file_extension, derivatives)
 
-            nominee.image_path = str(file_path.relative_to(Path(settings.media_folder)))
-            await session.commit()
+            nominee.image_path = image_path
+            nominee.image_formats = image_formats
+            await commit_catalog_change(session)
             await message.answer("✅ Изображение номинанта обновлено.")
         else:
             await message.answer("❌ Номинант не найден.")
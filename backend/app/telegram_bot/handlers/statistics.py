@@ -1,10 +1,23 @@
+import asyncio
+import tempfile
+from pathlib import Path
+
 from aiogram import Router
-from aiogram.types import BufferedInputFile, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
+from aiogram.types import CallbackQuery, FSInputFile, InlineKeyboardButton, InlineKeyboardMarkup, Message
 
+from app.core.config import settings
 from app.db.session import async_session_factory
 from app.schemas.nomination import NominationResponse
 from app.services.nomination_service import get_all_nominations
+from app.services.export_service import (
+    ExportMode,
+    export_filename,
+    export_votes_columnar,
+    has_export_rows,
+    iter_export_csv,
+)
 from app.services.result_service import get_results_by_nomination
+from app.telegram_bot.input_files import SpooledInputFile
 from app.telegram_bot.states import StatisticsState
 
 router = Router()
@@ -74,39 +87,74 @@ async def show_nomination_statistics(callback: CallbackQuery) -> None:
     await callback.answer()
 
 
+def get_export_keyboard() -> InlineKeyboardMarkup:
+    """Эта функция создаёт клавиатуру выбора формата выгрузки."""
+
+    keyboard = [
+        [InlineKeyboardButton(text="📊 Итоги (CSV)", callback_data="export_aggregate")],
+        [InlineKeyboardButton(text="🗳️ Все голоса (CSV.gz)", callback_data="export_raw")],
+        [InlineKeyboardButton(text="🧮 Все голоса по колонкам (NumPy)", callback_data="export_columnar")],
+        [InlineKeyboardButton(text="◀️ Назад", callback_data="admin_menu")],
+    ]
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+
 @router.callback_query(lambda c: c.data == "admin_export")
-async def export_csv(callback: CallbackQuery) -> None:
-    """Этот хэндлер экспортирует результаты в CSV файл."""
+async def show_export_menu(callback: CallbackQuery) -> None:
+    """Этот хэндлер показывает меню выгрузки отчётов."""
 
-    import csv
-    import io
+    await callback.message.edit_text(
+        "📥 <b>Выгрузка отчёта</b>\n\nВыберите формат:",
+        reply_markup=get_export_keyboard(),
+    )
+    await callback.answer()
 
-    async with async_session_factory() as session:
-        from app.services.result_service import get_all_results
 
-        results = await get_all_results(session)
+@router.callback_query(lambda c: c.data in ("export_aggregate", "export_raw"))
+async def export_csv(callback: CallbackQuery) -> None:
+    """
+    Этот хэндлер выгружает CSV: итоги по номинантам или все голоса (в gzip).
 
-    if not results.nominations:
-        await callback.answer("❌ Нет данных для экспорта.", show_alert=True)
-        return
+    Выгрузка пишется кусками во временный файл, который остаётся в памяти, пока он
+    маленький, и уходит на диск, когда вырастает. Запись идёт в потоке, чтобы диск
+    не останавливал цикл событий.
+    """
 
-    # Создаём CSV в памяти
-    output = io.StringIO()
-    writer = csv.writer(output)
+    mode: ExportMode = "aggregate" if callback.data == "export_aggregate" else "raw"
+    compress = mode == "raw"
 
-    # Заголовки
-    writer.writerow(["Номинация", "Номинант", "Голосов"])
+    async with async_session_factory() as session:
+        if not await has_export_rows(session, mode):
+            await callback.answer("❌ Нет данных для экспорта.", show_alert=True)
+            return
+    await callback.answer("⏳ Готовлю выгрузку...")
+
+    with tempfile.SpooledTemporaryFile(max_size=settings.export_spool_max_bytes) as file:
+        async for chunk in iter_export_csv(mode, compress=compress):
+            await asyncio.to_thread(file.write, chunk)
+
+        caption = "📥 Отчёт по результатам голосования" if mode == "aggregate" else "📥 Все голоса"
+        await callback.message.answer_document(
+            SpooledInputFile(file, export_filename(mode, compress)), caption=caption
+        )
 
-    # Данные
-    for nomination_result in results.nominations:
-        for nominee in nomination_result.nominees:
-            writer.writerow([nomination_result.nomination_title, nominee.name, nominee.vote_count])
 
-    csv_content = output.getvalue()
-    output.close()
+@router.callback_query(lambda c: c.data == "export_columnar")
+async def export_columnar(callback: CallbackQuery) -> None:
+    """
+    Этот хэндлер выгружает все голоса по колонкам: zip с файлами .npy.
 
-    # Отправляем файл
-    file = BufferedInputFile(csv_content.encode("utf-8"), filename="results.csv")
-    await callback.message.answer_document(file, caption="📥 Отчёт по результатам голосования")
-    await callback.answer("Отчёт отправлен")
+    Открыть выгрузку без копирования в память можно так:
+    app.utils.columnar.load_columns("votes.zip").
+    """
 
+    await callback.answer("⏳ Готовлю выгрузку...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        zip_path = Path(directory) / "votes.zip"
+        rows = await export_votes_columnar(zip_path)
+        await callback.message.answer_document(
+            FSInputFile(zip_path),
+            caption=f"🧮 Все голоса по колонкам: {rows}\n"
+            "telegram_user_id, nominee_id, nomination_id, created_at (.npy)",
+        )
@@ -2,7 +2,7 @@ from aiogram import Router
 from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
 
 from app.db.session import async_session_factory
-from app.services.settings_service import is_voting_open, set_setting_value
+from app.services.settings_service import VOTING_OPEN, is_voting_open, set_setting
 
 router = Router()
 
@@ -43,7 +43,7 @@ async def start_voting(callback: CallbackQuery) -> None:
     """Этот хэндлер запускает голосование."""
 
     async with async_session_factory() as session:
-        await set_setting_value(session, "voting_open", "true")
+        await set_setting(session, VOTING_OPEN, True)
 
     await callback.message.edit_text(
         "✅ <b>Голосование запущено!</b>\n\nТеперь пользователи могут голосовать в Mini App.",
@@ -57,7 +57,7 @@ async def stop_voting(callback: CallbackQuery) -> None:
     """Этот хэндлер останавливает голосование."""
 
     async with async_session_factory() as session:
-        await set_setting_value(session, "voting_open", "false")
+        await set_setting(session, VOTING_OPEN, False)
 
     await callback.message.edit_text(
         "⏸️ <b>Голосование остановлено.</b>\n\nПользователи больше не могут голосовать.",
@@ -0,0 +1,26 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import IO
+
+from aiogram import Bot
+from aiogram.types import InputFile
+
+
+class SpooledInputFile(InputFile):
+    """
+    Этот файл для отправки в Telegram читается кусками из уже записанного файла.
+
+    Подходит для tempfile.SpooledTemporaryFile: маленькая выгрузка остаётся в памяти,
+    большая уходит на диск, и ни в каком случае не копируется целиком в bytes.
+    Чтение идёт в потоке: файл, ушедший на диск, не останавливает цикл событий.
+    Закрывать файл после отправки должен вызывающий код.
+    """
+
+    def __init__(self, file: IO[bytes], filename: str) -> None:
+        super().__init__(filename=filename)
+        self.file = file
+
+    async def read(self, bot: Bot) -> AsyncGenerator[bytes, None]:
+        await asyncio.to_thread(self.file.seek, 0)
+        while chunk := await asyncio.to_thread(self.file.read, self.chunk_size):
+            yield chunk
@@ -3,7 +3,6 @@ from typing import Any, Awaitable, Callable
 from aiogram import BaseMiddleware
 from aiogram.types import CallbackQuery, Message, TelegramObject
 
-from app.db.session import async_session_factory
 from app.services.admin_service import is_admin
 
 
@@ -25,14 +24,14 @@ class AdminMiddleware(BaseMiddleware):
             user_id = event.from_user.id if event.from_user else None
 
         if user_id:
-            async with async_session_factory() as session:
-                if await is_admin(session, user_id):
-                    return await handler(event, data)
-                else:
-                    if isinstance(event, Message):
-                        await event.answer("❌ У вас нет прав администратора.")
-                    elif isinstance(event, CallbackQuery):
-                        await event.answer("❌ У вас нет прав администратора.", show_alert=True)
-                    return
+            # Проверка идёт по множеству администраторов в памяти, без запроса к БД
+            if await is_admin(user_id):
+                return await handler(event, data)
+            else:
+                if isinstance(event, Message):
+                    await event.answer("❌ У вас нет прав администратора.")
+                elif isinstance(event, CallbackQuery):
+                    await event.answer("❌ У вас нет прав администратора.", show_alert=True)
+                return
         return await handler(event, data)
 
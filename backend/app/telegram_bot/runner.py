@@ -1,6 +1,8 @@
 import asyncio
 import logging
 
+from aiogram import Bot, Dispatcher
+
 from app.telegram_bot.bot import create_bot, create_dispatcher
 from app.telegram_bot.handlers import get_handlers_router
 from app.telegram_bot.middleware import AdminMiddleware
@@ -8,8 +10,8 @@ from app.telegram_bot.middleware import AdminMiddleware
 logger = logging.getLogger(__name__)
 
 
-async def start_polling() -> None:
-    """Эта функция запускает бота в режиме polling."""
+def setup_bot() -> tuple[Bot, Dispatcher]:
+    """Эта функция создаёт бота и диспетчер с мидлварами и хэндлерами."""
 
     bot = create_bot()
     dp = create_dispatcher()
@@ -20,10 +22,20 @@ async def start_polling() -> None:
 
     # Регистрируем хэндлеры
     dp.include_router(get_handlers_router())
+    return bot, dp
+
+
+async def start_polling() -> None:
+    """Эта функция запускает бота в режиме polling (запасной режим без вебхука)."""
+
+    bot, dp = setup_bot()
 
-    # Запускаем polling
+    # Вебхук и polling несовместимы: снимаем вебхук, если он остался
+    await bot.delete_webhook()
+
+    # Запускаем polling; сигналы обрабатывает uvicorn, а остановка приходит отменой задачи
     logger.info("Telegram bot started in polling mode")
-    await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
+    await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types(), handle_signals=False)
 
 
 def run_bot_in_background() -> None:
@@ -36,4 +48,3 @@ def run_bot_in_background() -> None:
             logger.error(f"Error running bot: {e}", exc_info=True)
 
     asyncio.create_task(_run())
-
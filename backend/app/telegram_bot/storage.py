@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import orjson
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.db.models import BotFsmState
+from app.db.notifications import notification_listener, notify
+from app.db.session import async_session_factory
+
+logger = logging.getLogger(__name__)
+
+FSM_CHANNEL = "vrp_fsm"
+
+
+class _Record:
+    """Эта запись кэша хранит состояние, данные диалога и момент устаревания (time.time)."""
+
+    __slots__ = ("state", "data", "expires_at")
+
+    def __init__(self, state: str | None, data: dict[str, Any], expires_at: float) -> None:
+        self.state = state
+        self.data = data
+        self.expires_at = expires_at
+
+
+def _storage_key(key: StorageKey) -> str:
+    """Эта функция сворачивает ключ хранилища aiogram в компактную строку."""
+
+    return ":".join(
+        (
+            str(key.bot_id),
+            str(key.chat_id),
+            str(key.user_id),
+            str(key.thread_id or ""),
+            key.business_connection_id or "",
+            key.destiny,
+        )
+    )
+
+
+class PostgresStorage(BaseStorage):
+    """
+    Это хранилище FSM aiogram в таблице bot_fsm_state с LRU-кэшем в памяти.
+
+    Запись идёт сквозь кэш сразу в БД, а чтение из кэша в БД не ходит. Каждый
+    диалог живёт fsm_ttl_seconds с последней записи. Кэш ограничен fsm_cache_size,
+    а при записи в другом воркере его запись сбрасывается по NOTIFY, поэтому
+    бот может обрабатывать обновления на любом воркере.
+    """
+
+    def __init__(self, ttl_seconds: int, cache_size: int) -> None:
+        self._ttl = ttl_seconds
+        self._cache_size = cache_size
+        self._cache: OrderedDict[str, _Record] = OrderedDict()
+        self._origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+    def start(self) -> None:
+        """Эта функция подписывает кэш на записи из других воркеров; вызывать до старта слушателя."""
+
+        notification_listener.subscribe(FSM_CHANNEL, self._on_state_changed)
+
+    async def close(self) -> None:
+        pass
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        return (await self._get(_storage_key(key))).state
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        return (await self._get(_storage_key(key))).data.copy()
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        storage_key = _storage_key(key)
+        record = await self._get(storage_key)
+        await self._write(storage_key, state.state if isinstance(state, State) else state, record.data)
+
+    async def set_data(self, key: StorageKey, data: dict[str, Any]) -> None:
+        storage_key = _storage_key(key)
+        record = await self._get(storage_key)
+        await self._write(storage_key, record.state, data.copy())
+
+    async def _get(self, storage_key: str) -> _Record:
+        """Эта функция отдаёт запись из кэша или читает её из БД (пустую, если диалога нет)."""
+
+        record = self._cache.get(storage_key)
+        if record is not None and record.expires_at > time.time():
+            self._cache.move_to_end(storage_key)
+            return record
+
+        async with async_session_factory() as session:
+            result = await session.execute(
+                select(BotFsmState.state, BotFsmState.data, BotFsmState.expires_at)
+                .where(BotFsmState.key == storage_key)
+                .where(BotFsmState.expires_at > func.now())
+            )
+            row = result.one_or_none()
+
+        if row is None:
+            # Отсутствие диалога тоже кэшируем, чтобы не спрашивать БД на каждом апдейте
+            record = _Record(None, {}, time.time() + self._ttl)
+        else:
+            record = _Record(row.state, orjson.loads(row.data) if row.data else {}, row.expires_at.timestamp())
+        self._remember(storage_key, record)
+        return record
+
+    async def _write(self, storage_key: str, state: str | None, data: dict[str, Any]) -> None:
+        """Эта функция записывает диалог в БД и кэш; пустой диалог удаляется."""
+
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self._ttl)
+        async with async_session_factory() as session:
+            if state is None and not data:
+                await session.execute(delete(BotFsmState).where(BotFsmState.key == storage_key))
+            else:
+                payload = orjson.dumps(data) if data else None
+                stmt = insert(BotFsmState).values(key=storage_key, state=state, data=payload, expires_at=expires_at)
+                await session.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=[BotFsmState.key],
+                        set_={"state": state, "data": payload, "expires_at": expires_at},
+                    )
+                )
+            await notify(session, FSM_CHANNEL, f"{self._origin} {storage_key}")
+            await session.commit()
+        self._remember(storage_key, _Record(state, data, expires_at.timestamp()))
+
+    def _remember(self, storage_key: str, record: _Record) -> None:
+        """Эта функция кладёт запись в LRU-кэш и вытесняет самые старые."""
+
+        self._cache[storage_key] = record
+        self._cache.move_to_end(storage_key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    async def _on_state_changed(self, payload: str) -> None:
+        """Этот обработчик сбрасывает запись кэша, изменённую другим воркером (или весь кэш)."""
+
+        if not payload:
+            self._cache.clear()
+            return
+        origin, _, storage_key = payload.partition(" ")
+        if origin != self._origin:
+            self._cache.pop(storage_key, None)
+
+    async def sweep(self) -> int:
+        """Эта функция удаляет из БД и кэша диалоги с истёкшим сроком."""
+
+        now = time.time()
+        for storage_key in [key for key, record in self._cache.items() if record.expires_at <= now]:
+            del self._cache[storage_key]
+
+        async with async_session_factory() as session:
+            result = await session.execute(delete(BotFsmState).where(BotFsmState.expires_at <= func.now()))
+            await session.commit()
+        return result.rowcount or 0
+
+
+fsm_storage = PostgresStorage(ttl_seconds=settings.fsm_ttl_seconds, cache_size=settings.fsm_cache_size)
+
+
+async def run_fsm_sweeper() -> None:
+    """Эта задача-синглтон периодически удаляет устаревшие диалоги из БД."""
+
+    while True:
+        await asyncio.sleep(settings.fsm_sweep_interval_seconds)
+        removed = await fsm_storage.sweep()
+        if removed:
+            logger.info("FSM sweeper removed %s expired conversations", removed)
@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+from typing import Any
+
+from aiogram import Bot, Dispatcher
+from fastapi import APIRouter, Header, HTTPException, Request, Response
+
+from app.core.config import settings
+from app.telegram_bot.runner import setup_bot
+from app.utils.secret_compare import secrets_equal
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_PATH = "/telegram/webhook"
+
+
+def webhook_secret() -> str:
+    """
+    Эта функция отдаёт секрет вебхука: из настроек или выведенный из токена бота.
+
+    Секрет используется и в пути вебхука, и в заголовке X-Telegram-Bot-Api-Secret-Token.
+    """
+
+    if settings.telegram_webhook_secret:
+        return settings.telegram_webhook_secret
+    return hmac.new(settings.telegram_bot_token.encode(), b"VrpWebhook", hashlib.sha256).hexdigest()[:32]
+
+
+class TelegramWebhook:
+    """
+    Этот приёмник передаёт обновления вебхука в диспетчер aiogram.
+
+    Каждое обновление обрабатывается в фоновой задаче, поэтому Telegram сразу
+    получает ответ. Задач в работе не больше max_concurrency: сверх этого
+    вебхук отвечает 503, и Telegram повторит доставку позже.
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        self._max_concurrency = max_concurrency
+        self._bot: Bot | None = None
+        self._dp: Dispatcher | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.processed = 0
+        self.rejected = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        """Этот флаг говорит, принимает ли воркер обновления вебхука."""
+
+        return self._bot is not None
+
+    async def start(self) -> None:
+        """Эта функция собирает диспетчер и регистрирует вебхук в Telegram."""
+
+        if self._bot is not None:
+            return
+        self._bot, self._dp = setup_bot()
+        url = f"{settings.telegram_webhook_url.rstrip('/')}{WEBHOOK_PATH}/{webhook_secret()}"
+        try:
+            await self._bot.set_webhook(
+                url,
+                secret_token=webhook_secret(),
+                allowed_updates=self._dp.resolve_used_update_types(),
+                max_connections=settings.telegram_webhook_max_concurrency,
+            )
+        except Exception as exc:
+            # Вебхук мог зарегистрировать другой воркер; обновления всё равно принимаем
+            logger.error("Failed to register Telegram webhook: %s", exc)
+        logger.info("Telegram bot started in webhook mode")
+
+    async def stop(self) -> None:
+        """Эта функция дожидается обновлений в работе и закрывает сессию бота."""
+
+        if self._bot is None:
+            return
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._bot.session.close()
+        self._bot = None
+        self._dp = None
+
+    def feed(self, update: dict[str, Any]) -> bool:
+        """Эта функция ставит обновление в обработку; False — если все слоты заняты."""
+
+        if len(self._tasks) >= self._max_concurrency:
+            self.rejected += 1
+            return False
+        task = asyncio.create_task(self._process(update))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def _process(self, update: dict[str, Any]) -> None:
+        """Эта функция прогоняет обновление через диспетчер и логирует ошибки."""
+
+        try:
+            await self._dp.feed_raw_update(self._bot, update)
+            self.processed += 1
+        except Exception as exc:
+            self.failed += 1
+            logger.error("Webhook update failed: %s", exc, exc_info=True)
+
+    def metrics(self) -> dict[str, int]:
+        """Эта функция отдаёт счётчики вебхука для /health."""
+
+        return {
+            "in_flight": len(self._tasks),
+            "processed": self.processed,
+            "rejected": self.rejected,
+            "failed": self.failed,
+        }
+
+
+telegram_webhook = TelegramWebhook(max_concurrency=settings.telegram_webhook_max_concurrency)
+
+router = APIRouter(tags=["telegram"], include_in_schema=False)
+
+
+@router.post(WEBHOOK_PATH + "/{secret}")
+async def receive_update(
+    secret: str,
+    request: Request,
+    x_telegram_bot_api_secret_token: str = Header(None, alias="X-Telegram-Bot-Api-Secret-Token"),
+) -> Response:
+    """Этот эндпоинт принимает обновления Telegram в режиме вебхука."""
+
+    expected = webhook_secret()
+    if not (
+        secrets_equal(secret, expected)
+        and secrets_equal(x_telegram_bot_api_secret_token or "", expected)
+    ):
+        raise HTTPException(status_code=403, detail="Неверный секрет вебхука")
+
+    if not telegram_webhook.running:
+        raise HTTPException(status_code=503, detail="Вебхук не запущен")
+    if not telegram_webhook.feed(await request.json()):
+        raise HTTPException(status_code=503, detail="Слишком много обновлений в обработке")
+    return Response(status_code=200)
@@ -0,0 +1,78 @@
+import zipfile
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+
+import numpy as np
+
+
+class ColumnarWriter:
+    """
+    Этот писатель заполняет по файлу .npy на колонку, зная заранее число строк.
+
+    Заголовок каждого файла пишется сразу по известной длине, а данные дописываются
+    кусками через отображение файла в память, поэтому в памяти процесса лежит
+    только текущий кусок.
+    """
+
+    def __init__(self, directory: Path, dtypes: Mapping[str, np.dtype], length: int) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        self.length = length
+        self.written = 0
+        self._columns = {
+            name: np.lib.format.open_memmap(directory / f"{name}.npy", mode="w+", dtype=dtype, shape=(length,))
+            for name, dtype in dtypes.items()
+        }
+
+    @property
+    def paths(self) -> list[Path]:
+        """Это пути файлов колонок."""
+
+        return [Path(column.filename) for column in self._columns.values()]
+
+    def append(self, chunk: Mapping[str, Sequence]) -> None:
+        """Эта функция дописывает кусок строк (одинаковой длины по всем колонкам)."""
+
+        size = len(next(iter(chunk.values())))
+        if self.written + size > self.length:
+            raise ValueError("Строк больше, чем объявлено в заголовке")
+        for name, column in self._columns.items():
+            column[self.written:self.written + size] = np.asarray(chunk[name], dtype=column.dtype)
+        self.written += size
+
+    def close(self) -> None:
+        """Эта функция сбрасывает данные на диск и проверяет, что все строки записаны."""
+
+        for column in self._columns.values():
+            column.flush()
+        self._columns.clear()
+        if self.written != self.length:
+            raise ValueError(f"Записано {self.written} строк из {self.length}")
+
+
+def zip_columns(paths: Sequence[Path], zip_path: Path) -> Path:
+    """Эта функция складывает файлы колонок в zip без сжатия (ZIP_STORED)."""
+
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for path in paths:
+            archive.write(path, arcname=path.name)
+    return zip_path
+
+
+def load_columns(path: str | Path) -> dict[str, np.ndarray]:
+    """
+    Эта функция открывает выгрузку по колонкам без копирования в память.
+
+    Принимает директорию с файлами .npy или zip-архив выгрузки; архив один раз
+    распаковывается в соседнюю директорию. Каждая колонка открывается через
+    np.load(mmap_mode="r"), то есть данные читаются с диска по мере обращения.
+    """
+
+    path = Path(path)
+    if path.suffix == ".zip":
+        directory = path.with_suffix("")
+        if not directory.is_dir():
+            with zipfile.ZipFile(path) as archive:
+                archive.extractall(directory)
+        path = directory
+
+    return {file.stem: np.load(file, mmap_mode="r") for file in sorted(path.glob("*.npy"))}
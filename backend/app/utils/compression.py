@@ -0,0 +1,43 @@
+import gzip
+
+import brotli
+
+# Тела меньше этого размера не сжимаем: заголовки съедят выигрыш
+MIN_COMPRESS_SIZE = 512
+
+
+def compress_variants(body: bytes) -> dict[str, bytes]:
+    """
+    Эта функция готовит сжатые варианты тела ответа: gzip и br.
+
+    Варианты считаются один раз при заполнении кэша, поэтому уровни сжатия высокие.
+    Вариант попадает в результат, только если он действительно меньше исходного тела.
+    """
+
+    if len(body) < MIN_COMPRESS_SIZE:
+        return {}
+
+    variants = {
+        "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+        "br": brotli.compress(body, quality=9),
+    }
+    return {encoding: data for encoding, data in variants.items() if len(data) < len(body)}
+
+
+def choose_encoding(accept_encoding: str | None, available: dict[str, bytes]) -> str | None:
+    """Эта функция выбирает лучшее из доступных сжатий по заголовку Accept-Encoding."""
+
+    if not accept_encoding or not available:
+        return None
+
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip().lower())
+
+    for encoding in ("br", "gzip"):
+        if encoding in available and (encoding in accepted or "*" in accepted):
+            return encoding
+    return None
@@ -0,0 +1,102 @@
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+
+from PIL import Image, ImageOps
+
+from app.utils.image_validator import validate_image_square
+from app.utils.media_store import DERIVATIVE_PREFIX, write_atomic
+
+try:
+    # До Pillow 11.2 AVIF доступен только через плагин
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+DERIVATIVE_SIZES = (128, 256, 512)
+
+# Параметры кодирования для каждого формата
+_SAVE_OPTIONS = {
+    "avif": {"quality": 55, "speed": 6},
+    "webp": {"quality": 80, "method": 5},
+}
+
+
+def _supported_formats() -> tuple[str, ...]:
+    """Эта функция выбирает форматы производных, которые умеет сохранять установленный Pillow."""
+
+    Image.init()
+    extensions = Image.registered_extensions()
+    # AVIF первым: браузер берёт первый подходящий <source>
+    return tuple(
+        fmt for fmt in ("avif", "webp") if extensions.get(f".{fmt}") in Image.SAVE
+    )
+
+
+DERIVATIVE_FORMATS = _supported_formats()
+
+
+def derivative_dir(image_path: str) -> str:
+    """Эта функция отдаёт относительный каталог производных для исходного изображения."""
+
+    return f"{DERIVATIVE_PREFIX}/{PurePosixPath(image_path).with_suffix('')}"
+
+
+def derivative_path(image_path: str, size: int, fmt: str) -> str:
+    """Эта функция отдаёт относительный путь производной заданного размера и формата."""
+
+    return f"{derivative_dir(image_path)}/{size}.{fmt}"
+
+
+def render_derivatives(image_data: bytes) -> dict[str, bytes]:
+    """
+    Эта функция кодирует квадратные уменьшенные копии изображения во всех форматах.
+
+    Возвращает словарь «имя файла -> байты», например {"256.webp": ...}.
+    Выполняется в пуле процессов, поэтому объявлена на уровне модуля.
+    """
+
+    image = ImageOps.exif_transpose(Image.open(BytesIO(image_data)))
+    image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+
+    derivatives: dict[str, bytes] = {}
+    for size in DERIVATIVE_SIZES:
+        resized = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        for fmt in DERIVATIVE_FORMATS:
+            buffer = BytesIO()
+            resized.save(buffer, format=fmt.upper(), **_SAVE_OPTIONS[fmt])
+            derivatives[f"{size}.{fmt}"] = buffer.getvalue()
+    return derivatives
+
+
+def prepare_image(image_data: bytes) -> tuple[bool, str, dict[str, bytes]]:
+    """
+    Эта функция за один проход проверяет изображение и строит его производные.
+
+    Ошибка кодирования копий не мешает сохранить изображение: производных просто не будет.
+    """
+
+    is_valid, error_msg = validate_image_square(image_data)
+    if not is_valid:
+        return False, error_msg, {}
+    try:
+        return True, "", render_derivatives(image_data)
+    except Exception:
+        return True, "", {}
+
+
+def built_formats(derivatives: dict[str, bytes]) -> list[str]:
+    """Эта функция отдаёт форматы, в которых построены копии всех размеров."""
+
+    return [
+        fmt
+        for fmt in DERIVATIVE_FORMATS
+        if all(f"{size}.{fmt}" in derivatives for size in DERIVATIVE_SIZES)
+    ]
+
+
+def write_derivatives(media_root: Path, image_path: str, derivatives: dict[str, bytes]) -> None:
+    """Эта функция атомарно записывает производные изображения в каталог медиа."""
+
+    directory = media_root / derivative_dir(image_path)
+    for file_name, data in derivatives.items():
+        write_atomic(directory / file_name, data)
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+from app.core.config import settings
+from app.utils.image_derivatives import prepare_image
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ImageExecutorBusy(Exception):
+    """Это исключение означает, что очередь обработки изображений заполнена."""
+
+
+def _timed_call(func: Callable[..., T], args: tuple[Any, ...]) -> tuple[float, float, T]:
+    """Эта функция выполняется в процессе пула и замеряет начало и длительность работы."""
+
+    started_at = time.time()
+    started = time.perf_counter()
+    result = func(*args)
+    return started_at, time.perf_counter() - started, result
+
+
+class ImageExecutor:
+    """
+    Этот исполнитель выносит декодирование, проверку и кодирование изображений в пул процессов.
+
+    Pillow держит GIL и процессор на больших файлах, поэтому в цикле событий такая
+    работа тормозит голосование. Одновременно принимается не больше
+    max_workers + max_queue задач: остальные сразу получают ImageExecutorBusy, и
+    админ видит просьбу повторить позже. Функции и аргументы должны сериализоваться
+    через pickle, то есть функции объявляются на уровне модуля.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        self._max_workers = max_workers
+        self._capacity = max_workers + max_queue
+        self._pool: ProcessPoolExecutor | None = None
+        self._pending = 0
+
+        self._tasks = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_seconds_total = 0.0
+        self._max_wait_seconds = 0.0
+        self._work_seconds_total = 0.0
+        self._last_work_seconds = 0.0
+        self._max_work_seconds = 0.0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Эта функция лениво создаёт пул процессов при первой задаче."""
+
+        if self._pool is None:
+            # spawn не копирует потоки и соединения воркера в дочерние процессы
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Эта функция выполняет func(*args) в пуле или бросает ImageExecutorBusy, если очередь полна."""
+
+        if self._pending >= self._capacity:
+            self._rejected += 1
+            raise ImageExecutorBusy()
+
+        self._pending += 1
+        submitted_at = time.time()
+        pool = self._get_pool()
+        try:
+            future = pool.submit(_timed_call, func, args)
+            started_at, work_seconds, result = await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            # Процесс пула упал (например, по памяти): следующая задача поднимет новый пул.
+            # Пул сбрасываем, только если его ещё не заменила другая задача того же сломанного пула
+            self._failed += 1
+            if self._pool is pool:
+                self.stop()
+            raise
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        wait_seconds = max(started_at - submitted_at, 0.0)
+        self._tasks += 1
+        self._wait_seconds_total += wait_seconds
+        self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+        self._work_seconds_total += work_seconds
+        self._last_work_seconds = work_seconds
+        self._max_work_seconds = max(self._max_work_seconds, work_seconds)
+        return result
+
+    def stop(self) -> None:
+        """Эта функция останавливает пул и отменяет задачи, которые ещё не начались."""
+
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def metrics(self) -> dict[str, Any]:
+        """Эта функция возвращает метрики пула: глубину очереди, ожидание и время обработки."""
+
+        return {
+            "workers": self._max_workers,
+            "in_flight": self._pending,
+            "capacity": self._capacity,
+            "tasks": self._tasks,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "avg_wait_ms": round(self._wait_seconds_total / self._tasks * 1000, 2) if self._tasks else 0,
+            "max_wait_ms": round(self._max_wait_seconds * 1000, 2),
+            "last_work_ms": round(self._last_work_seconds * 1000, 2),
+            "avg_work_ms": round(self._work_seconds_total / self._tasks * 1000, 2) if self._tasks else 0,
+            "max_work_ms": round(self._max_work_seconds * 1000, 2),
+        }
+
+
+image_executor = ImageExecutor(max_workers=settings.image_workers, max_queue=settings.image_queue_size)
+
+
+async def process_image(image_data: bytes) -> tuple[bool, str, dict[str, bytes]]:
+    """
+    Эта функция проверяет изображение и строит его производные в пуле процессов.
+
+    Возвращает (успех, сообщение об ошибке, производные); при заполненной очереди
+    или сбое обработки просит повторить, чтобы диалог админа не обрывался без ответа.
+    """
+
+    try:
+        return await image_executor.run(prepare_image, image_data)
+    except ImageExecutorBusy:
+        return False, "Сейчас обрабатывается слишком много изображений, отправьте его ещё раз через минуту", {}
+    except Exception as exc:
+        # Упал процесс пула (BrokenProcessPool) или Pillow не смог разобрать файл
+        logger.warning("Image processing failed: %s", exc, exc_info=True)
+        return False, "Не удалось обработать изображение, отправьте его ещё раз или пришлите другой файл", {}
@@ -4,10 +4,11 @@ from PIL import Image
 
 
 def is_square_image(image_data: bytes) -> bool:
-    """Эта функция проверяет, является ли изображение квадратным."""
+    """Эта функция проверяет, что изображение декодируется целиком и является квадратным."""
 
     try:
         image = Image.open(BytesIO(image_data))
+        image.load()
         width, height = image.size
         return width == height
     except Exception:
@@ -0,0 +1,32 @@
+from collections.abc import Iterable
+
+from app.utils.image_derivatives import DERIVATIVE_SIZES, derivative_path
+
+MEDIA_PREFIX = "/media/"
+
+
+def media_url(image_path: str) -> str:
+    """Эта функция превращает относительный путь изображения в URL раздачи /media."""
+
+    if image_path.startswith("/") or image_path.startswith("http"):
+        return image_path
+    return MEDIA_PREFIX + image_path
+
+
+def media_srcset(image_path: str, formats: Iterable[str]) -> dict[str, str]:
+    """
+    Эта функция отдаёт srcset производных изображения по построенным форматам.
+
+    Например {"webp": "/media/derived/x/128.webp 128w, ..."}; форматы берутся из
+    image_formats строки, поэтому в srcset не попадают несуществующие файлы.
+    Для внешних изображений производных нет и словарь пустой.
+    """
+
+    if image_path.startswith("/") or image_path.startswith("http"):
+        return {}
+    return {
+        fmt: ", ".join(
+            f"{MEDIA_PREFIX}{derivative_path(image_path, size, fmt)} {size}w" for size in DERIVATIVE_SIZES
+        )
+        for fmt in formats
+    }
@@ -0,0 +1,101 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+BLOB_PREFIX = "blobs"
+DERIVATIVE_PREFIX = "derived"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def blob_path(digest: str, suffix: str) -> str:
+    """Эта функция отдаёт относительный путь блоба по его SHA-256 и расширению."""
+
+    return f"{BLOB_PREFIX}/{digest[:2]}/{digest}{suffix}"
+
+
+def is_blob_path(relative_path: str) -> bool:
+    """Эта функция проверяет, что путь указывает в контентно-адресуемое хранилище (включая производные)."""
+
+    return relative_path.startswith(f"{BLOB_PREFIX}/") or relative_path.startswith(f"{DERIVATIVE_PREFIX}/{BLOB_PREFIX}/")
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """
+    Эта функция атомарно записывает файл: временный файл, fsync, rename.
+
+    Читатель видит либо старый файл, либо новый целиком, а после сбоя питания
+    не остаётся файла с частью данных.
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(data)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+    # Фиксируем на диске и саму запись каталога о переименовании
+    dir_fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def store_blob(media_root: Path, data: bytes, suffix: str) -> str:
+    """
+    Эта функция сохраняет файл под именем его SHA-256 и возвращает относительный путь.
+
+    Одинаковые загрузки ложатся в один блоб и не перезаписываются.
+    """
+
+    relative_path = blob_path(hashlib.sha256(data).hexdigest(), suffix.lower())
+    path = media_root / relative_path
+    if path.is_file():
+        # Обновляем mtime, чтобы сборщик мусора не удалил блоб до фиксации ссылки на него
+        os.utime(path)
+    else:
+        write_atomic(path, data)
+    return relative_path
+
+
+class MediaStaticFiles(StaticFiles):
+    """
+    Эта раздача /media отдаёт блобы хранилища как неизменяемые.
+
+    Имя блоба — его SHA-256, поэтому по одному URL всегда лежат одни и те же байты:
+    браузер кэширует их на год без перепроверки, а ETag — сам хэш из пути.
+    Файлы со старыми именами по-прежнему перепроверяются при каждом обращении.
+    """
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        relative_path = Path(self.get_path(scope)).as_posix()
+        if is_blob_path(relative_path):
+            # ETag — хэш блоба (и имя производной): blobs/ab/<sha>.jpg, derived/blobs/ab/<sha>/256.webp
+            parts = relative_path.split("/")
+            response.headers["etag"] = '"' + "-".join(parts[parts.index(BLOB_PREFIX) + 2:]) + '"'
+            response.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["cache-control"] = "no-cache"
+
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,129 @@
+import hashlib
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+from app.utils.compression import choose_encoding, compress_variants
+from app.utils.json_response import dumps
+
+
+class CachedResponse:
+    """Эта запись кэша хранит готовое JSON-тело, его сжатые варианты и ETag."""
+
+    __slots__ = ("version", "body", "variants", "etag")
+
+    def __init__(self, version: Hashable, body: bytes, compress: bool = True) -> None:
+        self.version = version
+        self.body = body
+        self.variants = compress_variants(body) if compress else {}
+        self.etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+    def etag_for(self, encoding: str | None) -> str:
+        """Эта функция отдаёт ETag конкретного представления (у сжатых — свой суффикс)."""
+
+        return self.etag if encoding is None else f'{self.etag[:-1]}-{encoding}"'
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """Эта функция проверяет, есть ли у клиента уже это тело (в любом сжатии)."""
+
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        known = {self.etag_for(None), *(self.etag_for(encoding) for encoding in self.variants)}
+        for tag in if_none_match.split(","):
+            tag = tag.strip().removeprefix("W/")
+            if tag in known:
+                return True
+        return False
+
+
+def respond_cached(
+    request: Request,
+    entry: CachedResponse,
+    media_type: str = "application/json",
+    cache_control: str = "no-cache",
+) -> Response:
+    """
+    Эта функция отдаёт готовое тело из записи кэша.
+
+    Совпадение If-None-Match даёт 304 без тела, иначе отдаётся лучшее
+    представление по Accept-Encoding.
+    """
+
+    encoding = choose_encoding(request.headers.get("accept-encoding"), entry.variants)
+    headers = {
+        "ETag": entry.etag_for(encoding),
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
+    if entry.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+
+    if encoding is None:
+        return Response(entry.body, media_type=media_type, headers=headers)
+    headers["Content-Encoding"] = encoding
+    return Response(entry.variants[encoding], media_type=media_type, headers=headers)
+
+
+class ResponseCache:
+    """
+    Этот кэш хранит сериализованные ответы по ключу маршрута и версии данных.
+
+    На ключ хранится только последняя версия: как только версия данных меняется
+    (правка каталога, новые голоса), запись пересобирается при следующем чтении.
+    Горячее чтение — это поиск в словаре и отправка готовых байтов.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(
+        self, key: Hashable, version: Hashable, build: Callable[[], Awaitable[Any]]
+    ) -> CachedResponse:
+        """Эта функция отдаёт запись из кэша или собирает её через build() (данные или модель Pydantic)."""
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.version == version:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = CachedResponse(version, dumps(await build()))
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        """Эта функция очищает кэш целиком."""
+
+        self._entries.clear()
+
+    def metrics(self) -> dict[str, int]:
+        """Эта функция отдаёт счётчики попаданий для /health."""
+
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    async def respond(
+        self,
+        request: Request,
+        key: Hashable,
+        version: Hashable,
+        build: Callable[[], Awaitable[Any]],
+    ) -> Response:
+        """Эта функция отвечает на запрос из кэша (см. respond_cached)."""
+
+        entry = await self.get(key, version, build)
+        return respond_cached(request, entry)
+
+
+response_cache = ResponseCache(max_entries=settings.response_cache_size)
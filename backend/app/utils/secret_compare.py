@@ -0,0 +1,12 @@
+import hmac
+
+
+def secrets_equal(provided: str, expected: str) -> bool:
+    """
+    Эта функция сравнивает секреты за постоянное время.
+
+    Сравниваются байты UTF-8: на строках с не-ASCII символами compare_digest
+    бросает TypeError, и клиент получил бы 500 вместо отказа в доступе.
+    """
+
+    return hmac.compare_digest(provided.encode(), expected.encode())
@@ -0,0 +1,49 @@
+import base64
+import hashlib
+import hmac
+import time
+from functools import lru_cache
+
+from app.core.config import settings
+from app.utils.secret_compare import secrets_equal
+
+
+@lru_cache(maxsize=4)
+def _signing_key(secret: str) -> bytes:
+    """Эта функция выводит ключ подписи сессий из секрета (по умолчанию из токена бота)."""
+
+    return hmac.new(key=b"VrpSession", msg=secret.encode(), digestmod=hashlib.sha256).digest()
+
+
+def _sign(payload: str) -> str:
+    """Эта функция подписывает полезную нагрузку токена укороченным HMAC-SHA256."""
+
+    key = _signing_key(settings.session_secret or settings.telegram_bot_token)
+    digest = hmac.new(key, payload.encode(), hashlib.sha256).digest()[:16]
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def issue_session_token(user_id: int) -> tuple[str, int]:
+    """
+    Эта функция выпускает компактный токен сессии вида «user_id.expires_at.signature».
+
+    Токен не хранится на сервере: всё нужное для проверки лежит в нём самом.
+    Возвращает токен и момент его истечения (unix time).
+    """
+
+    expires_at = int(time.time()) + settings.session_token_ttl_seconds
+    payload = f"{user_id}.{expires_at}"
+    return f"{payload}.{_sign(payload)}", expires_at
+
+
+def verify_session_token(token: str) -> int | None:
+    """Эта функция проверяет подпись и срок токена и возвращает user_id или None."""
+
+    payload, _, signature = token.rpartition(".")
+    if not payload or not secrets_equal(signature, _sign(payload)):
+        return None
+
+    user_id, _, expires_at = payload.partition(".")
+    if int(expires_at) <= time.time():
+        return None
+    return int(user_id)
@@ -0,0 +1,90 @@
+import asyncio
+import functools
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, ParamSpec, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# Вычисления в полёте: ключ вызова -> future с результатом ведущего вызова
+_in_flight: dict[Hashable, asyncio.Future] = {}
+# Метрики по функциям: имя -> {"calls": выполнено вычислений, "coalesced": присоединилось ожидающих}
+_metrics: dict[str, dict[str, int]] = {}
+
+
+def _call_key(func: Callable[..., Any], args: tuple, kwargs: dict) -> tuple:
+    """Эта функция строит ключ вызова из имени функции и аргументов без сессий БД."""
+
+    positional = tuple(arg for arg in args if not isinstance(arg, AsyncSession))
+    named = tuple(sorted((name, value) for name, value in kwargs.items() if not isinstance(value, AsyncSession)))
+    return func.__module__, func.__qualname__, positional, named
+
+
+def _metrics_for(func: Callable[..., Any]) -> dict[str, int]:
+    """
+    Эта функция отдаёт счётчики функции, заводя их при декорировании.
+
+    Счётчики ведутся по функции, а не по аргументам: аргументы приходят от клиентов,
+    и словарь по ним рос бы без ограничений.
+    """
+
+    return _metrics.setdefault(f"{func.__module__}.{func.__qualname__}", {"calls": 0, "coalesced": 0})
+
+
+def single_flight(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+    """
+    Этот декоратор склеивает одновременные одинаковые вызовы асинхронной функции.
+
+    Первый вызов с данными аргументами выполняется как обычно, а все, кто пришёл,
+    пока он не закончился, ждут его результат вместо своего запроса к БД. Аргументы
+    AsyncSession в ключ не входят: вычисление идёт в сессии первого вызова.
+
+    Все ожидающие получают один и тот же объект, а не копии. Обёрнутые функции
+    отдают в том числе изменяемые dict и list, поэтому вызывающий код не должен
+    менять результат: правка увидят все, кто его ждал. Результат также не должен
+    ссылаться на ORM-объекты сессии.
+    """
+
+    metrics = _metrics_for(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        key = _call_key(func, args, kwargs)
+
+        while (future := _in_flight.get(key)) is not None:
+            metrics["coalesced"] += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Ведущий вызов отменили (клиент ушёл): если отменили не нас, пробуем снова
+                if not future.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        _in_flight[key] = future
+        metrics["calls"] += 1
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Исключение уже передано текущему вызову; ожидающих может не быть
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            _in_flight.pop(key, None)
+
+    return wrapper
+
+
+def single_flight_metrics() -> dict[str, dict[str, int]]:
+    """Эта функция отдаёт метрики склейки вызовов по функциям для /health."""
+
+    return {key: dict(values) for key, values in _metrics.items()}
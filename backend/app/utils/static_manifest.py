@@ -0,0 +1,78 @@
+import mimetypes
+import os
+from pathlib import Path
+
+from fastapi import Request, Response
+
+from app.utils.media_store import IMMUTABLE_CACHE_CONTROL
+from app.utils.response_cache import CachedResponse, respond_cached
+
+# Vite кладёт в assets/ только файлы с хэшем содержимого в имени
+HASHED_PREFIX = "assets/"
+INDEX_FILE = "index.html"
+
+# Остальные типы (картинки, шрифты woff2) уже сжаты
+_COMPRESSIBLE_TYPES = {
+    "application/javascript",
+    "application/json",
+    "application/manifest+json",
+    "application/wasm",
+    "image/svg+xml",
+    "text/javascript",
+}
+
+
+def _is_compressible(media_type: str) -> bool:
+    """Эта функция решает, есть ли смысл сжимать файл этого типа."""
+
+    return media_type.startswith("text/") or media_type in _COMPRESSIBLE_TYPES
+
+
+class StaticAsset:
+    """Этот файл сборки лежит в памяти вместе со сжатыми вариантами и ETag."""
+
+    __slots__ = ("entry", "media_type", "cache_control")
+
+    def __init__(self, body: bytes, media_type: str, cache_control: str) -> None:
+        self.entry = CachedResponse(None, body, compress=_is_compressible(media_type))
+        self.media_type = media_type
+        self.cache_control = cache_control
+
+
+class StaticManifest:
+    """
+    Этот манифест держит всю сборку фронтенда в памяти.
+
+    Файлы читаются и сжимаются (gzip, br) один раз при старте, поэтому запрос к
+    статике — это поиск в словаре без обращения к диску. Файлы из assets/ с хэшем
+    в имени кэшируются навсегда, остальные (index.html) перепроверяются по ETag.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self._assets: dict[str, StaticAsset] = {}
+        for dirpath, _, filenames in os.walk(directory):
+            for file_name in filenames:
+                path = Path(dirpath) / file_name
+                relative_path = path.relative_to(directory).as_posix()
+                media_type = mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+                cache_control = IMMUTABLE_CACHE_CONTROL if relative_path.startswith(HASHED_PREFIX) else "no-cache"
+                self._assets[relative_path] = StaticAsset(path.read_bytes(), media_type, cache_control)
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    def get(self, path: str) -> StaticAsset | None:
+        """Эта функция отдаёт файл сборки по относительному пути."""
+
+        return self._assets.get(path)
+
+    @property
+    def index(self) -> StaticAsset | None:
+        """Это index.html, которым отвечают на маршруты SPA."""
+
+        return self._assets.get(INDEX_FILE)
+
+    def respond(self, request: Request, asset: StaticAsset) -> Response:
+        """Эта функция отдаёт файл из памяти с учётом Accept-Encoding и If-None-Match."""
+
+        return respond_cached(request, asset.entry, media_type=asset.media_type, cache_control=asset.cache_control)
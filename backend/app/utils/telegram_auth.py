@@ -1,92 +1,123 @@
 import hashlib
 import hmac
 import json
+import logging
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from urllib.parse import parse_qsl
 
 from fastapi import HTTPException, Header
 
+from app.core.config import settings
+from app.utils.session_token import verify_session_token
+
+logger = logging.getLogger(__name__)
+
+BEARER_PREFIX = "Bearer "
+
+# Кэш уже проверенных initData: (токен, sha256 строки) -> (данные пользователя, срок годности)
+_verified_cache: OrderedDict[tuple[str, bytes], tuple[dict, float]] = OrderedDict()
+
+
+@lru_cache(maxsize=4)
+def _webapp_secret(bot_token: str) -> bytes:
+    """Эта функция один раз выводит секрет WebAppData из токена бота."""
+
+    return hmac.new(key=b"WebAppData", msg=bot_token.encode(), digestmod=hashlib.sha256).digest()
+
+
+def _remember_verified(key: tuple[str, bytes], user: dict, expires_at: float) -> None:
+    """Эта функция кладёт проверенные данные в ограниченный LRU-кэш."""
+
+    _verified_cache[key] = (user, expires_at)
+    _verified_cache.move_to_end(key)
+    while len(_verified_cache) > settings.telegram_auth_cache_size:
+        _verified_cache.popitem(last=False)
+
 
 def validate_telegram_init_data(init_data: str, bot_token: str) -> dict:
     """
     Валидирует Telegram initData и извлекает данные пользователя.
-    
+
+    Повторная проверка той же строки initData отвечает из кэша без HMAC и JSON.
+    Запись кэша живёт, пока не истёк срок auth_date + telegram_init_data_max_age_seconds.
+
     Args:
         init_data: Строка initData от Telegram WebApp
         bot_token: Токен бота
-        
+
     Returns:
         dict: Данные пользователя (включая user_id)
-        
+
     Raises:
-        HTTPException: Если данные невалидны
+        HTTPException: Если данные невалидны или устарели
     """
-    import logging
-    logger = logging.getLogger(__name__)
-    
+
+    now = time.time()
+    cache_key = (bot_token, hashlib.sha256(init_data.encode()).digest())
+    cached = _verified_cache.get(cache_key)
+    if cached is not None:
+        user, expires_at = cached
+        if expires_at > now:
+            _verified_cache.move_to_end(cache_key)
+            return user
+        del _verified_cache[cache_key]
+
     try:
-        logger.info(f"Получены initData длиной {len(init_data)} символов")
-        
         # Парсим initData
         parsed_data = dict(parse_qsl(init_data))
-        logger.info(f"Распарсены ключи: {list(parsed_data.keys())}")
-        
+
         # Извлекаем hash
-        data_check_string_parts = []
-        hash_value = None
-        
-        for key, value in sorted(parsed_data.items()):
-            if key == 'hash':
-                hash_value = value
-            else:
-                data_check_string_parts.append(f'{key}={value}')
-        
+        hash_value = parsed_data.pop('hash', None)
         if not hash_value:
-            logger.error("Отсутствует hash в initData")
+            logger.warning("Отсутствует hash в initData")
             raise HTTPException(status_code=401, detail="Отсутствует hash в initData")
-        
+
         # Формируем строку для проверки
-        data_check_string = '\n'.join(data_check_string_parts)
-        logger.info(f"Data check string создана, количество полей: {len(data_check_string_parts)}")
-        
-        # Создаём секретный ключ из токена бота
-        secret_key = hmac.new(
-            key=b"WebAppData",
-            msg=bot_token.encode(),
-            digestmod=hashlib.sha256
-        ).digest()
-        
+        data_check_string = '\n'.join(f'{key}={value}' for key, value in sorted(parsed_data.items()))
+
         # Вычисляем hash
         calculated_hash = hmac.new(
-            key=secret_key,
+            key=_webapp_secret(bot_token),
             msg=data_check_string.encode(),
             digestmod=hashlib.sha256
         ).hexdigest()
-        
+
         # Проверяем hash
-        if calculated_hash != hash_value:
-            logger.error(f"Hash не совпадает. Ожидается: {calculated_hash}, получен: {hash_value}")
+        if not hmac.compare_digest(calculated_hash, hash_value):
+            logger.warning("Hash initData не совпадает")
             raise HTTPException(status_code=401, detail="Невалидные данные Telegram")
-        
-        logger.info("Hash валиден!")
-        
+
+        # Проверяем срок годности данных
+        try:
+            auth_date = int(parsed_data.get('auth_date', ''))
+        except ValueError:
+            raise HTTPException(status_code=401, detail="Отсутствует auth_date в initData")
+        expires_at = auth_date + settings.telegram_init_data_max_age_seconds
+        if expires_at <= now:
+            raise HTTPException(status_code=401, detail="Данные авторизации устарели")
+
         # Извлекаем данные пользователя
         if 'user' not in parsed_data:
-            logger.error("Отсутствуют данные пользователя")
+            logger.warning("Отсутствуют данные пользователя")
             raise HTTPException(status_code=401, detail="Отсутствуют данные пользователя")
-        
+
         user_data = json.loads(parsed_data['user'])
-        logger.info(f"Пользователь извлечён: ID={user_data.get('id')}, username={user_data.get('username')}")
-        
-        return {
+        logger.debug("Пользователь извлечён: ID=%s", user_data.get('id'))
+
+        user = {
             'user_id': user_data.get('id'),
             'first_name': user_data.get('first_name'),
             'last_name': user_data.get('last_name'),
             'username': user_data.get('username'),
             'language_code': user_data.get('language_code'),
         }
-        
+        _remember_verified(cache_key, user, expires_at)
+        return user
+
     except json.JSONDecodeError as e:
-        logger.error(f"JSON decode error: {str(e)}")
+        logger.warning(f"JSON decode error: {str(e)}")
         raise HTTPException(status_code=400, detail="Невалидный формат данных")
     except HTTPException:
         raise
@@ -95,46 +126,62 @@ def validate_telegram_init_data(init_data: str, bot_token: str) -> dict:
         raise HTTPException(status_code=401, detail=f"Ошибка валидации: {str(e)}")
 
 
-async def get_telegram_user_id(
+async def get_init_data_user_id(
     x_telegram_init_data: str = Header(None, alias="X-Telegram-Init-Data")
 ) -> int:
     """
-    Dependency для получения telegram_user_id из заголовка.
-    
+    Dependency для получения telegram_user_id из initData в заголовке.
+
     Args:
         x_telegram_init_data: Telegram initData из заголовка запроса
-        
+
     Returns:
         int: Telegram user ID
-        
+
     Raises:
         HTTPException: Если данные невалидны или отсутствуют
     """
-    import logging
-    logger = logging.getLogger(__name__)
-    
-    from app.core.config import settings
-    
+
     # Режим разработки: пропускаем валидацию Telegram
     if settings.development_mode:
-        logger.info("Режим разработки: используется тестовый user_id")
         return 123456789
-    
-    logger.info(f"Заголовок X-Telegram-Init-Data присутствует: {bool(x_telegram_init_data)}")
-    
+
     if not x_telegram_init_data:
-        logger.error("Отсутствует заголовок X-Telegram-Init-Data")
         raise HTTPException(
             status_code=401,
             detail="Требуется авторизация через Telegram"
         )
-    
+
     user_data = validate_telegram_init_data(x_telegram_init_data, settings.telegram_bot_token)
-    
+
     if not user_data.get('user_id'):
-        logger.error("user_id отсутствует в данных пользователя")
+        logger.warning("user_id отсутствует в данных пользователя")
         raise HTTPException(status_code=401, detail="Не удалось получить user_id")
-    
-    logger.info(f"Авторизация успешна: user_id={user_data['user_id']}")
+
     return user_data['user_id']
 
+
+async def get_telegram_user_id(
+    authorization: str = Header(None),
+    x_telegram_init_data: str = Header(None, alias="X-Telegram-Init-Data"),
+) -> int:
+    """
+    Dependency для получения telegram_user_id из токена сессии или initData.
+
+    Токен из заголовка Authorization: Bearer проверяется одним HMAC без разбора
+    initData; без токена используется проверка initData.
+
+    Raises:
+        HTTPException: Если токен или данные невалидны
+    """
+
+    if authorization and authorization.startswith(BEARER_PREFIX):
+        try:
+            user_id = verify_session_token(authorization[len(BEARER_PREFIX):])
+        except ValueError:
+            user_id = None
+        if user_id is None:
+            raise HTTPException(status_code=401, detail="Токен сессии недействителен или истёк")
+        return user_id
+
+    return await get_init_data_user_id(x_telegram_init_data)
@@ -0,0 +1,96 @@
+"""
+Бенчмарк сериализации списка номинантов: Pydantic на каждую строку против лёгкого пути.
+
+База не нужна: строки результата синтезируются в памяти в той же форме, в какой
+их отдаёт SQLAlchemy (именованные кортежи колонок).
+
+Запуск из директории backend:
+    python -m benchmarks.serialization_benchmark --nominees 1000 --repeat 200
+"""
+
+import argparse
+import json
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from app.schemas.nominee import NomineeListResponse, NomineeWithVotesResponse
+from app.services.nominee_service import nominee_row_to_dict
+from app.utils.json_response import dumps
+
+NomineeRow = namedtuple("NomineeRow", "id nomination_id name image_path image_formats created_at vote_count")
+
+
+def _rows(count: int) -> list[NomineeRow]:
+    """Эта функция синтезирует строки номинантов с голосами."""
+
+    started = datetime(2024, 12, 1, tzinfo=timezone.utc)
+    return [
+        NomineeRow(
+            index,
+            index % 20 + 1,
+            f"Номинант {index}",
+            f"nominees/{index:06d}.jpg",
+            ["webp"],
+            started + timedelta(seconds=index),
+            index * 7 % 1000,
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def pydantic_path(rows: list[NomineeRow]) -> bytes:
+    """Эта функция повторяет прежний путь: словарь, модель на строку, сериализация моделью."""
+
+    nominees = []
+    for row in rows:
+        nominee_dict = {
+            "id": row.id,
+            "nomination_id": row.nomination_id,
+            "name": row.name,
+            "image_path": row.image_path,
+            "image_formats": row.image_formats,
+            "created_at": row.created_at,
+            "vote_count": row.vote_count,
+        }
+        nominees.append(NomineeWithVotesResponse(**nominee_dict))
+    return NomineeListResponse(nominees=nominees).model_dump_json().encode()
+
+
+def lean_path(rows: list[NomineeRow]) -> bytes:
+    """Эта функция повторяет лёгкий путь: словари из колонок и orjson."""
+
+    return dumps({"nominees": [nominee_row_to_dict(row, row.vote_count) for row in rows]})
+
+
+def _measure(name: str, path, rows: list[NomineeRow], repeat: int) -> float:
+    """Эта функция замеряет среднее время одного ответа и печатает его."""
+
+    path(rows)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        body = path(rows)
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"{name:>8}: {elapsed * 1000:7.2f} мс на ответ, {len(body) / 1024:.0f} КБ")
+    return elapsed
+
+
+def main() -> None:
+    """Эта функция сравнивает оба пути и проверяет, что JSON совпадает."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nominees", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = _rows(args.nominees)
+    if json.loads(pydantic_path(rows)) != json.loads(lean_path(rows)):
+        raise SystemExit("Ответы двух путей различаются")
+
+    before = _measure("pydantic", pydantic_path, rows, args.repeat)
+    after = _measure("lean", lean_path, rows, args.repeat)
+    print(f"ускорение: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Бенчмарк записи голосов: коммит на каждый запрос против буфера отложенной записи.
+
+Нужна живая база с применёнными миграциями, открытым голосованием и хотя бы одним
+номинантом. Голоса пишутся от синтетических пользователей и удаляются после прогона,
+а счётчики пересобираются.
+
+Запуск из директории backend:
+    python -m benchmarks.vote_ingest_benchmark --votes 5000 --concurrency 500
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import delete, select
+
+from app.db.models import Nominee, UserVoteIndex, Vote
+from app.db.session import async_session_factory, async_engine
+from app.services.vote_count_service import reconcile_vote_counts
+from app.services.vote_ingest import VoteIngestBuffer
+from app.services.vote_service import _flush_vote_batch, insert_votes
+
+# Синтетические пользователи берутся из диапазона, которого нет у Telegram
+SYNTHETIC_USER_BASE = 9_000_000_000_000
+
+
+async def _direct_vote(item: tuple[int, int, int]) -> None:
+    """Эта функция повторяет текущий путь запроса: своя сессия и свой коммит."""
+
+    async with async_session_factory() as session:
+        await insert_votes(session, [item])
+        await session.commit()
+
+
+async def _run(name: str, votes: int, concurrency: int, vote) -> None:
+    """Эта функция прогоняет голоса с ограниченной параллельностью и печатает задержки."""
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await vote(index)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(votes)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    quantile = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000  # noqa: E731
+    print(
+        f"{name:>8}: {votes / elapsed:8.0f} голосов/с, "
+        f"p50={quantile(0.5):.1f}мс p95={quantile(0.95):.1f}мс p99={quantile(0.99):.1f}мс, "
+        f"среднее={statistics.fmean(latencies) * 1000:.1f}мс"
+    )
+
+
+async def main() -> None:
+    """Эта функция сравнивает оба режима записи на одном номинанте."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--votes", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--delay-ms", type=int, default=20)
+    args = parser.parse_args()
+
+    async with async_session_factory() as session:
+        nominee = (await session.execute(select(Nominee).limit(1))).scalar_one_or_none()
+    if nominee is None:
+        raise SystemExit("Нужен хотя бы один номинант")
+
+    def item(base: int, index: int) -> tuple[int, int, int]:
+        return (base + index, nominee.id, nominee.nomination_id)
+
+    direct_base = SYNTHETIC_USER_BASE
+    batched_base = SYNTHETIC_USER_BASE + args.votes
+
+    buffer = VoteIngestBuffer(
+        flush=_flush_vote_batch,
+        max_batch_size=args.batch_size,
+        max_delay_ms=args.delay_ms,
+        max_queue_size=args.concurrency * 2,
+    )
+    try:
+        await _run("direct", args.votes, args.concurrency, lambda i: _direct_vote(item(direct_base, i)))
+
+        buffer.start()
+        await _run("batched", args.votes, args.concurrency, lambda i: buffer.submit(item(batched_base, i)))
+        await buffer.stop()
+        print(f"метрики буфера: {buffer.metrics()}")
+    finally:
+        async with async_session_factory() as session:
+            await session.execute(delete(Vote).where(Vote.telegram_user_id >= SYNTHETIC_USER_BASE))
+            await session.execute(
+                delete(UserVoteIndex).where(UserVoteIndex.telegram_user_id >= SYNTHETIC_USER_BASE)
+            )
+            await session.commit()
+            await reconcile_vote_counts(session)
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
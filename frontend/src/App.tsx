@@ -1,6 +1,7 @@
 import { useEffect } from 'react';
 import { BrowserRouter, Routes, Route } from 'react-router-dom';
 import { QueryClient, QueryClientProvider } from '@tanstack/react-query';
+import { api } from './api/client';
 import { NavBar } from './components/NavBar';
 import { MainPage } from './pages/MainPage';
 import { NominationsPage } from './pages/NominationsPage';
@@ -65,10 +66,26 @@ const queryClient = new QueryClient({
     queries: {
       refetchOnWindowFocus: false,
       retry: 1,
+      // Данные из /bootstrap считаются свежими и не перезапрашиваются сразу
+      staleTime: 30_000,
     },
   },
 });
 
+// Раскладываем стартовое состояние по кэшу запросов страниц
+const loadBootstrap = async () => {
+  const { nominations, voted_nomination_ids } = await api.getBootstrap();
+  queryClient.setQueryData(
+    ['nominations'],
+    nominations.map(({ nominees: _nominees, ...nomination }) => nomination),
+  );
+  for (const { nominees, ...nomination } of nominations) {
+    queryClient.setQueryData(['nomination', nomination.id], nomination);
+    queryClient.setQueryData(['nominees', nomination.id], nominees);
+  }
+  queryClient.setQueryData(['myVotes'], voted_nomination_ids);
+};
+
 function App() {
   useEffect(() => {
     // Инициализация Telegram Web App
@@ -76,6 +93,8 @@ function App() {
       window.Telegram.WebApp.ready();
       window.Telegram.WebApp.expand();
     }
+    // Без стартового состояния страницы просто загрузят данные сами
+    loadBootstrap().catch(() => undefined);
   }, []);
 
   return (
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import type { Nomination, Nominee, NominationResult, ResultsSummary, VoteRequest, VoteResponse } from '../types';
+import type { Bootstrap, Nomination, Nominee, NominationResult, ResultsStreamEvent, ResultsSummary, SessionToken, VoteBatchResponse, VoteRequest, VoteResponse, VotedNominations } from '../types';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || '/api';
 
@@ -18,8 +18,44 @@ const client = axios.create({
   },
 });
 
-// Добавляем interceptor для автоматической отправки Telegram initData
-client.interceptors.request.use((config) => {
+// Токен сессии, полученный в обмен на initData
+let session: SessionToken | null = null;
+let sessionRequest: Promise<string | null> | null = null;
+
+// Получаем токен сессии (один запрос на обмен, даже если вызовов много)
+const getSessionToken = async (): Promise<string | null> => {
+  // Обновляем токен заранее, за минуту до истечения
+  if (session && session.expires_at - 60 > Date.now() / 1000) {
+    return session.token;
+  }
+  const initData = getTelegramInitData();
+  if (!initData) {
+    return null;
+  }
+  if (!sessionRequest) {
+    sessionRequest = axios
+      .post<SessionToken>(`${API_BASE_URL}/auth/session`, null, {
+        headers: { 'X-Telegram-Init-Data': initData },
+      })
+      .then((response) => {
+        session = response.data;
+        return session.token;
+      })
+      .catch(() => null)
+      .finally(() => {
+        sessionRequest = null;
+      });
+  }
+  return sessionRequest;
+};
+
+// Добавляем interceptor: токен сессии, а если обмен не удался — initData
+client.interceptors.request.use(async (config) => {
+  const token = await getSessionToken();
+  if (token) {
+    config.headers['Authorization'] = `Bearer ${token}`;
+    return config;
+  }
   const initData = getTelegramInitData();
   if (initData) {
     config.headers['X-Telegram-Init-Data'] = initData;
@@ -28,6 +64,12 @@ client.interceptors.request.use((config) => {
 });
 
 export const api = {
+  // Стартовое состояние Mini App одним запросом
+  getBootstrap: async (): Promise<Bootstrap> => {
+    const response = await client.get<Bootstrap>('/bootstrap');
+    return response.data;
+  },
+
   // Номинации
   getNominations: async (): Promise<Nomination[]> => {
     const response = await client.get<{ nominations: Nomination[] }>('/nominations');
@@ -51,6 +93,16 @@ export const api = {
     return response.data;
   },
 
+  voteBatch: async (votes: VoteRequest[]): Promise<VoteResponse[]> => {
+    const response = await client.post<VoteBatchResponse>('/votes/batch', { votes });
+    return response.data.results;
+  },
+
+  getMyVotes: async (): Promise<number[]> => {
+    const response = await client.get<VotedNominations>('/votes/me');
+    return response.data.nomination_ids;
+  },
+
   // Результаты
   getResults: async (): Promise<ResultsSummary> => {
     const response = await client.get<ResultsSummary>('/results');
@@ -61,5 +113,15 @@ export const api = {
     const response = await client.get<NominationResult>(`/results/${nominationId}`);
     return response.data;
   },
+
+  // Поток результатов: снимок счётчиков, затем только изменения
+  subscribeResults: (onEvent: (event: ResultsStreamEvent) => void): (() => void) => {
+    const source = new EventSource(`${API_BASE_URL}/results/stream`);
+    const handle = (message: MessageEvent<string>) => onEvent(JSON.parse(message.data));
+    source.addEventListener('snapshot', handle);
+    source.addEventListener('delta', handle);
+    source.addEventListener('reload', handle);
+    return () => source.close();
+  },
 };
 
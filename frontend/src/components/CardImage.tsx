@@ -0,0 +1,21 @@
+interface CardImageProps {
+  src: string;
+  srcset?: Record<string, string>;
+  alt: string;
+}
+
+// Карточки стоят в две колонки, поэтому браузеру хватает копии шириной в полэкрана
+const CARD_IMAGE_SIZES = '50vw';
+
+export const CardImage = ({ src, srcset = {}, alt }: CardImageProps) => {
+  const imageUrl = src.startsWith('http') || src.startsWith('/') ? src : `/${src}`;
+
+  return (
+    <picture className="block w-full h-full">
+      {Object.entries(srcset).map(([format, value]) => (
+        <source key={format} type={`image/${format}`} srcSet={value} sizes={CARD_IMAGE_SIZES} />
+      ))}
+      <img src={imageUrl} alt={alt} loading="lazy" className="w-full h-full object-cover" />
+    </picture>
+  );
+};
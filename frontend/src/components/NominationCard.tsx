@@ -1,5 +1,6 @@
 import { Link } from 'react-router-dom';
 import type { Nomination } from '../types';
+import { CardImage } from './CardImage';
 
 interface NominationCardProps {
   nomination: Nomination;
@@ -7,20 +8,10 @@ interface NominationCardProps {
 }
 
 export const NominationCard = ({ nomination, to }: NominationCardProps) => {
-  const imageUrl = nomination.image_path.startsWith('http')
-    ? nomination.image_path
-    : nomination.image_path.startsWith('/')
-    ? nomination.image_path
-    : `/${nomination.image_path}`;
-
   const content = (
     <div className="bg-white rounded-lg shadow-md overflow-hidden hover:shadow-lg transition-shadow">
       <div className="aspect-square w-full">
-        <img
-          src={imageUrl}
-          alt={nomination.title}
-          className="w-full h-full object-cover"
-        />
+        <CardImage src={nomination.image_path} srcset={nomination.image_srcset} alt={nomination.title} />
       </div>
       <div className="p-3">
         <h3 className="text-sm font-semibold text-gray-800 text-center line-clamp-2">
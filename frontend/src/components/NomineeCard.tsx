@@ -1,4 +1,5 @@
 import type { Nominee } from '../types';
+import { CardImage } from './CardImage';
 
 interface NomineeCardProps {
   nominee: Nominee;
@@ -13,20 +14,10 @@ export const NomineeCard = ({
   showVoteButton = false,
   isVotingDisabled = false,
 }: NomineeCardProps) => {
-  const imageUrl = nominee.image_path.startsWith('http')
-    ? nominee.image_path
-    : nominee.image_path.startsWith('/')
-    ? nominee.image_path
-    : `/${nominee.image_path}`;
-
   return (
     <div className="bg-white rounded-lg shadow-md overflow-hidden">
       <div className="aspect-square w-full">
-        <img
-          src={imageUrl}
-          alt={nominee.name}
-          className="w-full h-full object-cover"
-        />
+        <CardImage src={nominee.image_path} srcset={nominee.image_srcset} alt={nominee.name} />
       </div>
       <div className="p-3">
         <h3 className="text-sm font-semibold text-gray-800 mb-2">{nominee.name}</h3>
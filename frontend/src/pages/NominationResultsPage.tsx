@@ -1,6 +1,8 @@
+import { useEffect } from 'react';
 import { useParams } from 'react-router-dom';
-import { useQuery } from '@tanstack/react-query';
+import { useQuery, useQueryClient } from '@tanstack/react-query';
 import { api } from '../api/client';
+import type { NominationResult } from '../types';
 import { NomineeCard } from '../components/NomineeCard';
 import { ErrorMessage } from '../components/ErrorMessage';
 import { Loader } from '../components/Loader';
@@ -14,6 +16,31 @@ export const NominationResultsPage = () => {
     queryFn: () => api.getNominationResults(nominationId),
     enabled: !!nominationId,
   });
+  const queryClient = useQueryClient();
+
+  // Обновляем счётчики из потока результатов вместо периодических запросов
+  useEffect(() => {
+    if (!nominationId) return;
+    const queryKey = ['nomination-results', nominationId];
+    return api.subscribeResults((event) => {
+      if (event.type === 'reload') {
+        queryClient.invalidateQueries({ queryKey });
+        return;
+      }
+      const counts = event.counts || {};
+      queryClient.setQueryData<NominationResult>(queryKey, (current) => {
+        if (!current) return current;
+        const nominees = current.nominees
+          .map((nominee) => ({
+            ...nominee,
+            // В снимке нет номинантов без голосов, в дельте — неизменившихся
+            vote_count: counts[nominee.id] ?? (event.type === 'snapshot' ? 0 : nominee.vote_count),
+          }))
+          .sort((a, b) => (b.vote_count || 0) - (a.vote_count || 0));
+        return { ...current, nominees };
+      });
+    });
+  }, [nominationId, queryClient]);
 
   if (isLoading) return <Loader />;
   if (error) {
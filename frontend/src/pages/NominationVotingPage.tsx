@@ -23,9 +23,17 @@ export const NominationVotingPage = () => {
     enabled: !!nominationId,
   });
 
+  const { data: votedNominationIds } = useQuery({
+    queryKey: ['myVotes'],
+    queryFn: api.getMyVotes,
+  });
+
   const voteMutation = useMutation({
     mutationFn: api.vote,
     onSuccess: (data) => {
+      if (data.success || data.already_voted) {
+        queryClient.invalidateQueries({ queryKey: ['myVotes'] });
+      }
       if (data.success) {
         queryClient.invalidateQueries({ queryKey: ['nominees', nominationId] });
         navigate(`/vote/confirm`, {
@@ -65,7 +73,8 @@ export const NominationVotingPage = () => {
     );
   }
 
-  const isVotingDisabled = voteMutation.isPending || voteMutation.isError;
+  const alreadyVoted = votedNominationIds?.includes(nominationId) ?? false;
+  const isVotingDisabled = voteMutation.isPending || voteMutation.isError || alreadyVoted;
 
   return (
     <div className="min-h-screen bg-gray-50 pb-20">
@@ -83,6 +92,13 @@ export const NominationVotingPage = () => {
             </p>
           </div>
         )}
+        {alreadyVoted && !voteMutation.data && (
+          <div className="bg-yellow-50 border border-yellow-200 rounded-lg p-4 mb-4">
+            <p className="text-yellow-800 text-sm font-medium">
+              Вы уже проголосовали в этой номинации
+            </p>
+          </div>
+        )}
         {voteMutation.data && !voteMutation.data.success && (
           <div className="bg-yellow-50 border border-yellow-200 rounded-lg p-4 mb-4">
             <p className="text-yellow-800 text-sm font-medium">
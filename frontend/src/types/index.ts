@@ -2,6 +2,7 @@ export interface Nomination {
   id: number;
   title: string;
   image_path: string;
+  image_srcset?: Record<string, string>;
   created_at: string;
 }
 
@@ -10,6 +11,7 @@ export interface Nominee {
   nomination_id: number;
   name: string;
   image_path: string;
+  image_srcset?: Record<string, string>;
   created_at: string;
   vote_count?: number;
 }
@@ -27,6 +29,29 @@ export interface VoteResponse {
   already_voted?: boolean;
 }
 
+export interface VoteBatchResponse {
+  results: VoteResponse[];
+}
+
+export interface BootstrapNomination extends Nomination {
+  nominees: Nominee[];
+}
+
+export interface Bootstrap {
+  nominations: BootstrapNomination[];
+  voting_open: boolean;
+  voted_nomination_ids: number[];
+}
+
+export interface VotedNominations {
+  nomination_ids: number[];
+}
+
+export interface SessionToken {
+  token: string;
+  expires_at: number;
+}
+
 export interface NominationResult {
   nomination_id: number;
   nomination_title: string;
@@ -37,3 +62,9 @@ export interface ResultsSummary {
   nominations: NominationResult[];
 }
 
+
+export interface ResultsStreamEvent {
+  type: 'snapshot' | 'delta' | 'reload';
+  version: number;
+  counts?: Record<string, number>;
+}